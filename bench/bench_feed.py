@@ -0,0 +1,85 @@
+# bench/bench_feed.py
+# 홈 피드의 읽기 지연 vs 쓰기 증폭 측정
+# active 사용자 수를 바꿔 가며 글 작성(fan-out) 비용과 피드 읽기 비용을 비교한다.
+#
+#   python -m bench.bench_feed --posts 5000 --users 100 1000 10000
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from utils.feed import FeedService
+
+
+class ListStore:
+    """벤치마크용: 최신순 목록과 ID 조회만 제공하는 게시글 저장소"""
+
+    def __init__(self):
+        self.posts = []
+
+    def iter_latest(self):
+        return reversed(self.posts)
+
+    def get(self, post_id: str):
+        return next((p for p in self.posts if p["post_id"] == post_id), None)
+
+
+def percentile(samples: list[float], p: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def run(active_users: int, posts: int, likes_per_post: int):
+    store = ListStore()
+    feed = FeedService(store)
+    base = datetime.now(timezone.utc) - timedelta(hours=1)
+    users = [f"user{i}@example.com" for i in range(active_users)]
+
+    # 과거 글을 깔아 두고, 모든 사용자가 한 번씩 피드를 읽어 active 상태로 만든다
+    for i in range(posts):
+        store.posts.append({"post_id": f"old{i}", "created_at": (base - timedelta(minutes=i)).isoformat()})
+    store.posts.reverse()
+    start = time.perf_counter()
+    for email in users:
+        feed.read(email, 1, 20)
+    cold_ms = (time.perf_counter() - start) * 1000 / active_users
+
+    # 새 글 작성 + 좋아요 (쓰기 경로)
+    feed.fanout_writes = 0
+    write_ops = 0
+    start = time.perf_counter()
+    for i in range(posts):
+        post = {"post_id": f"new{i}", "created_at": (base + timedelta(seconds=i)).isoformat()}
+        store.posts.append(post)
+        feed.on_post(post)
+        write_ops += 1
+        for _ in range(random.randint(0, likes_per_post)):
+            feed.on_like(post["post_id"])
+            write_ops += 1
+    write_us = (time.perf_counter() - start) * 1e6 / write_ops
+
+    # 읽기 경로
+    reads = []
+    for _ in range(5000):
+        email = random.choice(users)
+        t = time.perf_counter()
+        feed.read(email, random.randint(1, 5), 20)
+        reads.append((time.perf_counter() - t) * 1e6)
+
+    print(f"users={active_users:6d}  write amplification={feed.fanout_writes / write_ops:8.1f} timeline writes/op"
+          f"  write={write_us:9.1f}us/op  read p50={percentile(reads, 0.5):6.1f}us p99={percentile(reads, 0.99):6.1f}us"
+          f"  cold build={cold_ms:7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--likes-per-post", type=int, default=10)
+    parser.add_argument("--users", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+    for active_users in args.users:
+        run(active_users, args.posts, args.likes_per_post)
+
+
+if __name__ == "__main__":
+    main()
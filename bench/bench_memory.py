@@ -0,0 +1,70 @@
+# bench/bench_memory.py
+# 게시글을 dict 로 들고 있을 때와 utils.records 압축 표현으로 들고 있을 때의
+# RSS 를 비교한다. 각 방식은 별도 프로세스에서 측정해 서로 영향을 주지 않게 한다.
+#
+#   python -m bench.bench_memory --posts 1000000
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+
+from utils.records import IdMap, post_from_dict
+
+
+def rss_bytes() -> int:
+    """현재 프로세스의 RSS(바이트)"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def make_posts(n: int, authors: int = 1000):
+    # json.load 결과와 같도록 레코드마다 별도의 문자열 객체를 만든다
+    for i in range(n):
+        yield json.loads(json.dumps({
+            "post_id": str(i + 1),
+            "title": f"title {i}",
+            "content": "본문",
+            "author_email": f"user{i % authors}@example.com",
+            "created_at": f"2026-01-{i % 28 + 1:02d}T12:00:00+00:00",
+        }))
+
+
+def measure(mode: str, n: int) -> int:
+    gc.collect()
+    before = rss_bytes()
+    if mode == "dict":
+        store = list(make_posts(n))
+    else:
+        ids = IdMap()
+        store = [post_from_dict(p, ids) for p in make_posts(n)]
+    gc.collect()
+    used = rss_bytes() - before
+    del store
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--mode", choices=["dict", "compact"])
+    args = parser.parse_args()
+
+    if args.mode:
+        print(measure(args.mode, args.posts))
+        return
+
+    per_million = {}
+    for mode in ("dict", "compact"):
+        out = subprocess.run(
+            [sys.executable, "-m", "bench.bench_memory", "--posts", str(args.posts), "--mode", mode],
+            capture_output=True, text=True, check=True,
+        )
+        per_million[mode] = int(out.stdout) * 1_000_000 / args.posts
+        print(f"{mode:8s} RSS per 1M posts: {per_million[mode] / 2**20:8.1f} MiB")
+    print(f"saving: {1 - per_million['compact'] / per_million['dict']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
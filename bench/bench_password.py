@@ -0,0 +1,54 @@
+# bench/bench_password.py
+# 요청 한 건당 비밀번호 검증 비용 측정
+#   - 기존 방식(re.search 4번) vs PasswordPolicy(set 한 번 + isdisjoint)
+#   - LoginRequest / CreateUser 모델 검증 전체 비용
+#
+#   python -m bench.bench_password
+import re
+import timeit
+
+from schemas.auth import LoginRequest
+from schemas.common import validate_password_logic
+from schemas.user import CreateUser
+
+
+def validate_password_regex(v: str) -> str:
+    # 비교용: 이전 구현
+    if len(v) < 8:
+        raise ValueError("비밀번호는 최소 8자 이상이어야 합니다.")
+    if not re.search(r'[A-Za-z]', v):
+        raise ValueError('비밀번호에 영문자가 포함되어야 합니다')
+    if not re.search(r'\d', v):
+        raise ValueError('비밀번호에 숫자가 포함되어야 합니다')
+    if not re.search(r'[!@#$%^&*(),.?":{}|<>₩]', v):
+        raise ValueError('비밀번호에 특수문자가 포함되어야 합니다')
+    return v
+
+
+def bench(label: str, fn, number: int = 200_000):
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    print(f"{label:36s} {best / number * 1e9:8.0f} ns/req")
+
+
+def main():
+    password = "Password123!"
+    login = {"email": "example@naver.com", "password": password}
+    signup = {"email": "example@naver.com", "password": password, "nickname": "abc"}
+
+    bench("regex policy (before)", lambda: validate_password_regex(password))
+    bench("PasswordPolicy.validate", lambda: validate_password_logic(password))
+    bench("LoginRequest.model_validate", lambda: LoginRequest.model_validate(login), 50_000)
+    bench("CreateUser.model_validate", lambda: CreateUser.model_validate(signup), 50_000)
+    oversized = {"email": "example@naver.com", "password": "x" * 1_000_000}
+    bench("LoginRequest reject 1MB password", lambda: _reject(oversized), 2_000)
+
+
+def _reject(data: dict):
+    try:
+        LoginRequest.model_validate(data)
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    main()
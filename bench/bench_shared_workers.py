@@ -0,0 +1,63 @@
+# bench/bench_shared_workers.py
+# 4개의 워커 프로세스가 같은 SharedIndex 를 열고, 한 워커가 좋아요를 누른 뒤
+# 나머지 워커가 그 좋아요를 보기까지 걸린 시간을 잰다.
+#
+#   python -m bench.bench_shared_workers --workers 4 --rounds 200
+import argparse
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+from utils.shared import SharedIndex
+
+
+def worker(rank: int, path: str, rounds: int, barrier, written, results):
+    index = SharedIndex(path)
+    latencies = []
+    for r in range(rounds):
+        post_id = f"post_{r}"
+        barrier.wait()
+        if rank == 0:
+            index.like_status(post_id, "user@example.com")  # 쓰기 전 값을 캐시에 올려 둔다
+            written.value = time.perf_counter()
+            index.add_like(post_id, "user@example.com", "2026-01-01T00:00:00+00:00")
+        else:
+            while index.like_status(post_id, "user@example.com") != (1, True):
+                pass
+            latencies.append(time.perf_counter() - written.value)
+        barrier.wait()
+    results.put((rank, latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "shared_index.db")
+    SharedIndex(path)  # 스키마를 먼저 만들어 둔다
+    barrier = mp.Barrier(args.workers)
+    written = mp.Value("d", 0.0)
+    results = mp.Queue()
+    procs = [
+        mp.Process(target=worker, args=(rank, path, args.rounds, barrier, written, results))
+        for rank in range(args.workers)
+    ]
+    for p in procs:
+        p.start()
+    latencies = []
+    for _ in procs:
+        latencies.extend(results.get()[1])
+    for p in procs:
+        p.join()
+
+    latencies.sort()
+    ms = [x * 1000 for x in latencies]
+    print(f"workers={args.workers} rounds={args.rounds} samples={len(ms)}")
+    print(f"visible after: p50={ms[len(ms) // 2]:.2f}ms p99={ms[int(len(ms) * 0.99)]:.2f}ms max={ms[-1]:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,53 @@
+import asyncio
+import os
+import anyio
+from contextlib import asynccontextmanager
 from typing import Annotated
 from datetime import datetime, timezone
-from fastapi import FastAPI, Query, Body, status, Header, Response, Path
+from fastapi import FastAPI, Query, Body, status, Header, Response, Path, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from enum import Enum
 from pydantic import EmailStr
 from schemas import user, post, auth
 from schemas.post import PostUpdateResponse, PostLikeCreateResponse
 from schemas.common import PostSortType, Pagination, validate_password_logic
 from routers import users, posts, auth
-
-app = FastAPI()
+from utils.pubsub import hub
+from utils.shared import shared_index
+from utils.auth import decode_access_token, revoke_user_tokens, configure_bcrypt_rounds
+from utils.cache import CachedLoader
+from utils.compression import CompressionMiddleware, choose_encoding, compress_async, MINIMUM_SIZE
+from utils.partition import post_store, comment_store
+from utils.index import load_indexes, load_nicknames
+from utils.integrity import run_background
+from utils.feed import FeedService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 서버 시작 시 CPU 성능에 맞춰 bcrypt cost 결정
+    configure_bcrypt_rounds()
+    # INTEGRITY_CHECK_INTERVAL(초)이 있으면 백그라운드에서 data/ 정합성 검사
+    interval = float(os.getenv("INTEGRITY_CHECK_INTERVAL", "0"))
+    checker = asyncio.create_task(run_background(interval)) if interval > 0 else None
+    yield
+    if checker is not None:
+        checker.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
+
+def liked_posts(post_ids: list[str], email: str) -> set[str]:
+    """post_ids 중 email 이 이미 좋아요한 글"""
+    return {pid for pid, (_, liked) in shared_index.like_status_many(post_ids, email).items() if liked}
+
+
+# 사용자별 홈 피드 (글 작성/좋아요 시 미리 만들어 둔 타임라인을 갱신)
+feed = FeedService(post_store, liked=liked_posts if shared_index is not None else None)
+
+# 게시글 상세 응답 캐시 (직렬화된 JSON 본문을 바이트 크기 기준으로 보관)
+post_detail_cache = CachedLoader(max_bytes=int(os.getenv("POST_CACHE_MAX_BYTES", str(32 * 1024 * 1024))))
 app.include_router(users.router)
 app.include_router(auth.router)
 @app.post('/')
@@ -141,6 +180,45 @@ async def get_user_likes(
 
 
 
+# 내 홈 피드 (최신순 + 좋아요 속도 반영)
+@app.get("/users/me/feed", response_model=post.PostListResponse)
+async def get_user_feed(
+        authorization: Annotated[str, Header(description="Bearer access token")],
+        page: int = Query(default=1, ge=1, description="페이지 번호"),
+        limit: int = Query(default=20, ge=1, le=100, description="페이지당 항목 수")
+):
+    payload = decode_access_token(authorization.removeprefix("Bearer "))
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={
+                "status": "error",
+                "error": {
+                    "code": "UNAUTHORIZED",
+                    "message": "유효하지 않은 토큰입니다."
+                }
+            }
+        )
+    post_ids, total = feed.read(payload["sub"], page, limit)
+    found = post_store.get_many(post_ids)
+    while len(found) < len(post_ids):
+        # 저장소에서 사라진 글은 타임라인에서도 빼고 다시 읽어서 data 와 total 을 맞춘다
+        for pid in post_ids:
+            if pid not in found:
+                feed.on_delete(pid)
+        post_ids, total = feed.read(payload["sub"], page, limit)
+        found = post_store.get_many(post_ids)
+    return {
+        "status": "success",
+        "data": post_summaries([found[pid] for pid in post_ids]),
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total
+        }
+    }
+
+
 # 프로필 수정
 @app.put("/users/me", response_model=user.UpdateUserResponse)
 async def put_user(
@@ -164,12 +242,33 @@ async def put_user(
 async def delete_user(
         authorization: Annotated[str, Header(description="로그인 시 발급되는 토큰")]
 ):
+    payload = decode_access_token(authorization.removeprefix("Bearer "))
+    if payload is not None:
+        # 탈퇴한 사용자에게 이미 발급된 access/refresh token 을 모두 무효화
+        revoke_user_tokens(payload["sub"])
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 ######Posts############
 # GET 먼저 생성
-# 게시글 목록 조회
+def post_summaries(records: list[dict]) -> list[dict]:
+    """저장된 게시글에 작성자 닉네임을 붙여 목록 응답 형태로 만듭니다."""
+    nicknames = load_nicknames()
+    return [
+        {
+            "post_id": p["post_id"],
+            "title": p["title"],
+            "author": {
+                "author_email": p["author_email"],
+                "nickname": nicknames.get(p["author_email"], "")
+            },
+            "created_at": p["created_at"]
+        }
+        for p in records
+    ]
+
+
+# 게시글 목록 조회 (최신순, 월별 파티션에서 필요한 만큼만 읽음)
 @app.get("/posts", response_model=post.PostListResponse)
 async def get_posts(
         page: int = Query(default=1, ge=1, description="페이지 번호"),
@@ -177,21 +276,11 @@ async def get_posts(
 ):
     return {
         "status": "success",
-        "data": [
-            {
-                "post_id": "1",
-                "title": "postname",
-                "author": {
-                    "author_email": "example@naver.com",
-                    "nickname": "abc"
-                },
-                "created_at": "2026-01-07T08:30:00+09:00"
-            }
-        ],
+        "data": post_summaries(post_store.page_latest(page, limit)),
         "pagination": {
             "page": page,
             "limit": limit,
-            "total": 100
+            "total": len(post_store)
         }
     }
 
@@ -203,27 +292,70 @@ async def get_posts_by_keyword(
         page: int = Query(default=1, ge=1, description="페이지 번호"),
         limit: int = Query(default=20, ge=1, le=100, description="페이지당 항목 수")
 ):
+    # 최신 파티션부터 훑다가 페이지가 채워지면 멈추므로, 오래된 파티션은 필요할 때만 읽는다
+    found = post_store.search(keyword, page, limit)
     return {
         "status": "success",
-        "data": [
-            {
-                "post_id": "1",
-                "title": f"'{keyword}' 검색 결과 제목",
-                "author": {
-                    "author_email": "example@naver.com",
-                    "nickname": "abc"
-                },
-                "created_at": "2026-01-04T12:00:00Z"
-            }
-        ],
+        "data": post_summaries(found),
         "pagination": {
             "page": page,
             "limit": limit,
-            "total": 100
+            "total": (page - 1) * limit + len(found)
         }
     }
 
 
+# 게시글 여러 건 조회 (피드 화면을 요청 한 번으로 채우기 위함)
+# /posts/{post_id} 보다 먼저 선언해야 "batch" 가 post_id 로 잡히지 않는다
+@app.get("/posts/batch", response_model=post.PostBatchResponse)
+async def get_posts_batch(
+        post_ids: Annotated[list[str], Query(min_length=1, max_length=100, description="조회할 게시글 ID 목록")]
+):
+    found = post_store.get_many(post_ids)
+    return {
+        "status": "success",
+        "data": post_summaries([found[pid] for pid in dict.fromkeys(post_ids) if pid in found])
+    }
+
+
+# 좋아요 상태 여러 건 확인
+@app.get("/posts/batch/likes", response_model=post.PostLikeBatchResponse)
+async def get_post_likes_batch(
+        post_ids: Annotated[list[str], Query(min_length=1, max_length=100, description="게시글 ID 목록")],
+        authorization: Annotated[str, Header(description="로그인 토큰")]
+):
+    payload = decode_access_token(authorization.removeprefix("Bearer "))
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={
+                "status": "error",
+                "error": {
+                    "code": "UNAUTHORIZED",
+                    "message": "유효하지 않은 토큰입니다."
+                }
+            }
+        )
+    email = payload["sub"]
+    post_ids = list(dict.fromkeys(post_ids))
+
+    if shared_index is not None:
+        statuses = shared_index.like_status_many(post_ids, email)
+    else:
+        likes_by_post = load_indexes()["likes_by_post"]
+        statuses = {}
+        for pid in post_ids:
+            likers = likes_by_post.get(pid, [])
+            statuses[pid] = (len(likers), email in likers)
+    return {
+        "status": "success",
+        "data": [
+            {"post_id": pid, "count_likes": count, "liked": liked}
+            for pid, (count, liked) in statuses.items()
+        ]
+    }
+
+
 # 게시글 정렬
 @app.get("/posts/sorted", response_model=post.PostSortedResponse)
 async def get_posts_sorted(
@@ -249,11 +381,9 @@ async def get_posts_sorted(
 
 
 # 게시글 상세조회
-@app.get("/posts/{post_id}", response_model=post.PostDetailResponse)
-async def get_post(
-        post_id: Annotated[str, Path(description="조회할 게시글 ID")]
-):
-    return {
+async def load_post_detail(post_id: str) -> bytes:
+    """게시글 + 작성자 정보를 모아 PostDetailResponse 를 JSON 바이트로 만듭니다."""
+    detail = {
         "status": "success",
         "data": {
             "post_id": post_id,
@@ -266,6 +396,27 @@ async def get_post(
             "created_at": "2026-01-04T12:00:00Z"
         }
     }
+    return post.PostDetailResponse.model_validate(detail).model_dump_json().encode("utf-8")
+
+
+@app.get("/posts/{post_id}", response_model=post.PostDetailResponse)
+async def get_post(
+        post_id: Annotated[str, Path(description="조회할 게시글 ID")],
+        request: Request
+):
+    # 같은 게시글에 대한 동시 요청은 한 번만 로딩하고, 결과는 캐시에서 그대로 내보낸다
+    body = await post_detail_cache.get(post_id, lambda: load_post_detail(post_id))
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is None or len(body) < MINIMUM_SIZE:
+        return Response(content=body, media_type="application/json")
+
+    # 압축본도 캐시에 따로 두어서 인기 게시글을 매번 다시 압축하지 않는다
+    compressed = await post_detail_cache.get(post_id, lambda: compress_async(body, encoding), variant=encoding)
+    return Response(
+        content=compressed,
+        media_type="application/json",
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    )
 
 
 # 댓글 목록 조회
@@ -303,6 +454,13 @@ async def get_post_likes(
         post_id: Annotated[str, Path(description="게시글 ID")],
         authorization: Annotated[str, Header(description="로그인 토큰")]
 ):
+    if shared_index is not None:
+        # 멀티 워커 모드: 모든 워커가 같은 값을 보도록 공유 인덱스에서 조회
+        count_likes, liked = shared_index.like_status(post_id, "example@naver.com")
+        return {
+            "status": "success",
+            "data": {"post_id": post_id, "count_likes": count_likes, "liked": liked}
+        }
     return {
         "status": "success",
         "data": {
@@ -313,6 +471,19 @@ async def get_post_likes(
     }
 
 
+# 게시글 실시간 이벤트 구독 (SSE)
+# 댓글 작성/수정/삭제, 좋아요 등록/취소가 일어나면 이벤트가 전달됩니다.
+@app.get("/posts/{post_id}/events")
+async def get_post_events(
+        post_id: Annotated[str, Path(description="구독할 게시글 ID")]
+):
+    return StreamingResponse(
+        hub.stream(post_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # 게시글 작성
 @app.post("/posts", response_model=post.CreationPostResponse, status_code=status.HTTP_201_CREATED)
 async def post_post(
@@ -320,18 +491,21 @@ async def post_post(
         post_in: Annotated[post.PostCreateRequest, Body()]
 
 ):
+    new_post = {
+        "post_id": "1",
+        "title": post_in.title,  # 사용자가 보낸 제목 그대로 사용
+        "content": post_in.content,  # 사용자가 보낸 내용 그대로 사용
+        "created_at": "2026-01-07T08:30:00+09:00",
+        "author": {
+            "author_email": "example@naver.com",
+            "nickname": "abc"
+        }
+    }
+    # 활성 사용자들의 피드에 바로 반영 (fan-out-on-write)
+    feed.on_post(new_post)
     return {
         "status": "success",
-        "data": {
-            "post_id": "1",
-            "title": post_in.title,  # 사용자가 보낸 제목 그대로 사용
-            "content": post_in.content,  # 사용자가 보낸 내용 그대로 사용
-            "created_at": "2026-01-07T08:30:00+09:00",
-            "author": {
-                "author_email": "example@naver.com",
-                "nickname": "abc"
-            }
-        }
+        "data": new_post
     }
 
 
@@ -342,6 +516,7 @@ async def put_post(
         authorization: Annotated[str, Header(description="로그인 토큰")],
         post_update: Annotated[post.PostUpdateRequest, Body()]
 ):
+    post_detail_cache.invalidate(post_id)
     return {
         "status": "success",
         "data": {
@@ -363,6 +538,8 @@ async def delete_post(
         post_id: Annotated[str, Path(description="삭제할 게시글 ID")],
         authorization: Annotated[str, Header(description="로그인 토큰")]
 ):
+    post_detail_cache.invalidate(post_id)
+    feed.on_delete(post_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -373,18 +550,20 @@ async def post_comment(
         authorization: Annotated[str, Header(description="로그인 토큰")],
         comment_in: Annotated[post.CommentCreateRequest, Body()]
 ):
+    comment = {
+        "post_id": post_id,
+        "comment_id": "comment_1",
+        "author": {
+            "author_email": "example@naver.com",
+            "nickname": "abc"
+        },
+        "content": comment_in.content,
+        "created_at": "2026-01-04T12:00:00Z"
+    }
+    hub.publish(post_id, "comment_created", comment)
     return {
         "status": "success",
-        "data": {
-            "post_id": post_id,
-            "comment_id": "comment_1",
-            "author": {
-                "author_email": "example@naver.com",
-                "nickname": "abc"
-            },
-            "content": comment_in.content,
-            "created_at": "2026-01-04T12:00:00Z"
-        }
+        "data": comment
     }
 
 
@@ -396,19 +575,21 @@ async def change_comment(
         authorization: Annotated[str, Header(description="로그인 토큰")],
         comment_update: Annotated[post.CommentUpdateRequest, Body()]
 ):
+    comment = {
+        "post_id": post_id,
+        "comment_id": comment_id,
+        "author": {
+            "author_email": "example@naver.com",
+            "nickname": "abc"
+        },
+        "content": comment_update.content,
+        "created_at": "2026-01-04T12:00:00Z",
+        "updated_at": "2026-01-05T12:00:00Z"
+    }
+    hub.publish(post_id, "comment_updated", comment)
     return {
         "status": "success",
-        "data": {
-            "post_id": post_id,
-            "comment_id": comment_id,
-            "author": {
-                "author_email": "example@naver.com",
-                "nickname": "abc"
-            },
-            "content": comment_update.content,
-            "created_at": "2026-01-04T12:00:00Z",
-            "updated_at": "2026-01-05T12:00:00Z"
-        }
+        "data": comment
     }
 
 
@@ -418,13 +599,22 @@ async def post_like(
         post_id: Annotated[str, Path(description="좋아요를 등록할 게시글 ID")],
         authorization: Annotated[str, Header(description="Bearer 토큰")]
 ):
+    like = {
+        "post_id": post_id,
+        "author_email": "example@naver.com",
+        "created_at": "2026-01-04T12:00:00Z"
+    }
+    added = True
+    if shared_index is not None:
+        # 다른 워커의 쓰기 잠금을 기다릴 수 있으므로(busy timeout) 이벤트 루프 밖에서 실행
+        added = await anyio.to_thread.run_sync(shared_index.add_like, post_id, like["author_email"], like["created_at"])
+    if added:
+        # 이미 누른 좋아요는 속도에 다시 세지 않는다
+        feed.on_like(post_id, like["author_email"])
+    hub.publish(post_id, "like_created", like)
     return {
         "status": "success",
-        "data": {
-            "post_id": post_id,
-            "author_email": "example@naver.com",
-            "created_at": "2026-01-04T12:00:00Z"
-        }
+        "data": like
     }
 
 
@@ -434,6 +624,9 @@ async def delete_like(
         post_id: Annotated[str, Path(description="좋아요를 취소할 게시글 ID")],
         authorization: Annotated[str, Header(description="로그인 토큰")]
 ):
+    if shared_index is not None:
+        await anyio.to_thread.run_sync(shared_index.remove_like, post_id, "example@naver.com")
+    hub.publish(post_id, "like_deleted", {"post_id": post_id, "author_email": "example@naver.com"})
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -444,6 +637,44 @@ async def delete_comment(
         comment_id: Annotated[str, Path(description="삭제할 댓글 ID")],
         authorization: Annotated[str, Header(description="로그인 토큰", alias="Authorization")]
 ):
+    payload = decode_access_token(authorization.removeprefix("Bearer "))
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={
+                "status": "error",
+                "error": {
+                    "code": "UNAUTHORIZED",
+                    "message": "로그인이 필요합니다."
+                }
+            }
+        )
+    comment = comment_store.get(comment_id)
+    if comment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "status": "error",
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": "댓글을 찾을 수 없습니다."
+                }
+            }
+        )
+    if comment["author_email"] != payload["sub"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "status": "error",
+                "error": {
+                    "code": "POST_DELETE_FORBIDDEN",
+                    "message": "본인이 작성한 댓글만 삭제할 수 있습니다."
+                }
+            }
+        )
+    comment_store.delete(comment_id)
+    # 경로에는 댓글 ID 만 있으므로 저장된 댓글의 post_id 로 구독자를 찾는다
+    hub.publish(comment["post_id"], "comment_deleted", {"comment_id": comment_id, "post_id": comment["post_id"]})
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
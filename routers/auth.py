@@ -1,13 +1,36 @@
+import time
 from fastapi import APIRouter, HTTPException, status, Body
 from typing import Annotated
 from schemas import auth
-from utils.data import load_data
-from utils.auth import verify_password, create_access_token
+from utils.data import load_data, save_data
+from utils.index import load_nicknames
+from utils.auth import (
+    verify_password, needs_rehash, hash_password, create_access_token, create_refresh_token, decode_refresh_token, revoke_token,
+    ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/token", status_code=status.HTTP_200_OK)
+def issue_tokens(email: str, auth_time: int | None = None):
+    """
+    access token + refresh token 한 쌍을 발급해서 응답 형태로 돌려줍니다.
+    auth_time: 처음 로그인한 시각. 로그인 때는 지금, refresh 때는 이전 토큰의 값을 물려준다.
+    """
+    claims = {"sub": email, "auth_time": auth_time if auth_time is not None else int(time.time())}
+    return {
+        "status": "success",
+        "data": {
+            "token_type": "Bearer",
+            "access_token": create_access_token(data=claims),
+            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            "refresh_token": create_refresh_token(data=claims),
+            "refresh_expires_in": REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+        }
+    }
+
+
+@router.post("/token", response_model=auth.LoginResponse, status_code=status.HTTP_200_OK)
 async def auth_token(
         login_data: Annotated[auth.LoginRequest, Body()]
 ):
@@ -28,13 +51,35 @@ async def auth_token(
             }
         )
 
+    # 저장된 해시의 cost 가 현재 설정보다 낮으면, 평문을 알고 있는 지금 다시 해싱해서 저장
+    if needs_rehash(user['password']):
+        user['password'] = hash_password(login_data.password)
+        try:
+            save_data(users, "users.json")
+        except Exception as e:
+            # 재해싱 저장에 실패해도 로그인 자체는 성공 처리 (다음 로그인 때 다시 시도)
+            print(f"비밀번호 재해싱 저장 중 에러 발생: {e}")
+
     # 사용자 식별정보(email)를 담은 진짜 JWT 토큰 생성
-    access_token = create_access_token(data={"sub": user['email']})
-    return {
-        "status": "success",
-        "data": {
-            "token_type": "Bearer",
-            "access_token": access_token,
-            "expires_in": 3600
-        }
-    }
\ No newline at end of file
+    return issue_tokens(user['email'])
+
+
+# 토큰 재발급 (bcrypt 검증 없이 refresh token 으로 새 토큰 발급)
+@router.post("/refresh", response_model=auth.LoginResponse, status_code=status.HTTP_200_OK)
+async def auth_refresh(
+        refresh_data: Annotated[auth.RefreshRequest, Body()]
+):
+    payload = decode_refresh_token(refresh_data.refresh_token)
+    # 무효화된 토큰(탈퇴 전에 로그인한 세션 포함)이거나 users.json 에 더 이상 없는 사용자면 거절
+    if payload is None or payload['sub'] not in load_nicknames():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={
+                "status": "error",
+                "message": "유효하지 않거나 만료된 refresh token 입니다."
+            }
+        )
+
+    # rotation: 사용한 refresh token 은 바로 무효화하고 새 토큰을 발급
+    revoke_token(payload)
+    return issue_tokens(payload['sub'], payload.get('auth_time', payload['iat']))
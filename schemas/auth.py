@@ -1,21 +1,23 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from .common import validate_password_logic
+from pydantic import BaseModel, EmailStr, Field
+from .common import PASSWORD_MAX_LENGTH
 
 
 class LoginRequest(BaseModel):
     email: EmailStr = Field(..., description="가입한 이메일", examples=["example@naver.com"])
-    password: str = Field(..., description="비밀번호(8자 이상, 영문/숫자/특수문자 포함)")
-
-    @field_validator("password")
-    @classmethod
-    def validate_password(cls, v: str) -> str:
-        # 이전에 정의한 공통 로직을 사용하여 의존성 분리 및 일관성 유지
-        return validate_password_logic(v)
+    # 로그인은 정책 검사를 하지 않는다 (틀린 비밀번호는 어차피 bcrypt 비교에서 걸러짐)
+    # 대신 길이만 제한해서 지나치게 긴 값이 bcrypt 까지 가지 않도록 한다
+    password: str = Field(..., min_length=1, max_length=PASSWORD_MAX_LENGTH,
+                          description="비밀번호(8자 이상, 영문/숫자/특수문자 포함)")
 
 class TokenData(BaseModel):
     token_type: str = Field("Bearer",description="토큰 타입")
     access_token: str = Field(...,description="실제 API에서 사용되는 토큰")
     expires_in: int = Field(3600, description="토큰 만료 시간(초)")
+    refresh_token: str = Field(...,description="access token 재발급용 토큰 (사용하면 새 토큰으로 교체됨)")
+    refresh_expires_in: int = Field(..., description="refresh token 만료 시간(초)")
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(...,description="로그인 또는 이전 재발급 때 받은 refresh token")
 
 class LoginResponse(BaseModel):
     status: str ="success"
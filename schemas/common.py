@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-import re
+import string
 from enum import Enum
 
 
@@ -15,16 +15,46 @@ class PostSortType(str, Enum):
     LIKES = "likes"
 
 
+# bcrypt 는 앞의 72바이트만 사용하므로 그보다 긴 비밀번호는 받지 않는다
+PASSWORD_MAX_LENGTH = 72
+
+# (포함되어야 하는 문자 집합, 에러 메시지) 목록 - 정책을 바꿀 때는 여기만 고치면 된다
+DEFAULT_PASSWORD_RULES = (
+    (string.ascii_letters, '비밀번호에 영문자가 포함되어야 합니다'),
+    (string.digits, '비밀번호에 숫자가 포함되어야 합니다'),
+    ('!@#$%^&*(),.?":{}|<>₩', '비밀번호에 특수문자가 포함되어야 합니다'),
+)
+
+
+class PasswordPolicy:
+    """
+    비밀번호 정책 검사기
+    문자 집합을 미리 frozenset 으로 만들어 두고, 입력은 set(v) 로 한 번만 훑는다.
+    """
+
+    def __init__(self, min_length: int = 8, max_length: int = PASSWORD_MAX_LENGTH,
+                 rules=DEFAULT_PASSWORD_RULES):
+        self.min_length = min_length
+        self.max_length = max_length
+        self.rules = tuple((frozenset(chars), message) for chars, message in rules)
+
+    def validate(self, v: str) -> str:
+        if len(v) < self.min_length:
+            raise ValueError(f"비밀번호는 최소 {self.min_length}자 이상이어야 합니다.")
+        if len(v.encode('utf-8')) > self.max_length:
+            raise ValueError(f"비밀번호는 최대 {self.max_length}바이트까지 사용할 수 있습니다.")
+        present = set(v)
+        for chars, message in self.rules:
+            if present.isdisjoint(chars):
+                raise ValueError(message)
+        return v
+
+
+password_policy = PasswordPolicy()
+
+
 def validate_password_logic(v: str) -> str:
     """
     공통 비밀번호 정책 로직 (예: 8자 이상, 특수문자 포함 등)
     """
-    if len(v) < 8:
-        raise ValueError("비밀번호는 최소 8자 이상이어야 합니다.")
-    if not re.search(r'[A-Za-z]', v):
-        raise ValueError('비밀번호에 영문자가 포함되어야 합니다')
-    if not re.search(r'\d', v):
-        raise ValueError('비밀번호에 숫자가 포함되어야 합니다')
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>₩]', v):
-        raise ValueError('비밀번호에 특수문자가 포함되어야 합니다')
-    return v
+    return password_policy.validate(v)
@@ -62,6 +62,14 @@ class PostLikeStatus(BaseModel):
 class PostLikeResponse(BaseModel):
     status: str = 'success'
     data: PostLikeStatus
+# 좋아요 상태 여러 건 확인
+class PostLikeBatchResponse(BaseModel):
+    status: str = 'success'
+    data: list[PostLikeStatus]
+# 게시글 요약 여러 건 조회 (없는 post_id 는 빠짐)
+class PostBatchResponse(BaseModel):
+    status: str = 'success'
+    data: list[PostPostSummary]
 # 게시글 작성
 # Request 데이터 보낼 데이터
 class PostCreateRequest(BaseModel):
@@ -0,0 +1,6 @@
+import os
+
+# utils.auth 는 import 시점에 환경 변수를 읽으므로 테스트용 기본값을 넣어 둔다
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import routers.auth
+from routers.auth import auth_refresh, issue_tokens
+from schemas.auth import RefreshRequest
+from utils.auth import decode_access_token, decode_refresh_token, revoke_user_tokens
+
+
+@pytest.fixture
+def users(monkeypatch):
+    users = {"a@x.com": "에이"}
+    monkeypatch.setattr(routers.auth, "load_nicknames", lambda: users)
+    return users
+
+
+def refresh(token: str) -> dict:
+    return asyncio.run(auth_refresh(RefreshRequest(refresh_token=token)))["data"]
+
+
+def test_refresh_rotates_and_keeps_auth_time(users):
+    tokens = issue_tokens("a@x.com")["data"]
+    first = decode_refresh_token(tokens["refresh_token"])
+    renewed = refresh(tokens["refresh_token"])
+    assert decode_refresh_token(tokens["refresh_token"]) is None
+    assert decode_access_token(renewed["access_token"])["auth_time"] == first["auth_time"]
+
+
+def test_deleted_account_cannot_refresh_even_within_the_same_second(users):
+    # denylist 는 모듈 전역이므로 다른 테스트와 겹치지 않는 사용자로 확인한다
+    users["deleted@x.com"] = "탈퇴"
+    tokens = issue_tokens("deleted@x.com")["data"]
+    revoke_user_tokens("deleted@x.com")
+    assert decode_access_token(tokens["access_token"]) is None
+    with pytest.raises(HTTPException) as exc:
+        refresh(tokens["refresh_token"])
+    assert exc.value.status_code == 401
+
+
+def test_refresh_is_refused_for_users_that_no_longer_exist(users):
+    tokens = issue_tokens("gone@x.com")["data"]
+    with pytest.raises(HTTPException):
+        refresh(tokens["refresh_token"])
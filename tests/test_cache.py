@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from utils.cache import ByteLFUCache, CachedLoader, SingleFlight
+
+
+def test_single_flight_shares_one_load():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"body"
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(*[flight.do("k", loader) for _ in range(50)])
+
+    assert asyncio.run(main()) == [b"body"] * 50
+    assert calls == 1
+
+
+def test_single_flight_first_caller_cancel_does_not_cancel_waiters():
+    async def loader():
+        await asyncio.sleep(0.05)
+        return b"body"
+
+    async def main():
+        flight = SingleFlight()
+        first = asyncio.create_task(flight.do("k", loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("k", loader))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await waiter
+
+    assert asyncio.run(main()) == b"body"
+
+
+def test_single_flight_propagates_errors_and_retries():
+    attempts = 0
+
+    async def loader():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise ValueError("boom")
+        return b"ok"
+
+    async def main():
+        flight = SingleFlight()
+        with pytest.raises(ValueError):
+            await flight.do("k", loader)
+        await asyncio.sleep(0)
+        return await flight.do("k", loader)
+
+    assert asyncio.run(main()) == b"ok"
+
+
+def test_lfu_evicts_least_frequently_used_by_bytes():
+    evicted = []
+    cache = ByteLFUCache(30, on_evict=evicted.append)
+    cache.set("a", b"1" * 10)
+    cache.set("b", b"1" * 10)
+    cache.get("a")
+    cache.set("c", b"1" * 10)
+    cache.set("d", b"1" * 10)
+    assert "a" in cache and "b" not in cache
+    assert evicted == ["b"]
+    assert cache.size == 30
+
+
+def test_lfu_rejects_value_larger_than_budget():
+    cache = ByteLFUCache(5)
+    cache.set("a", b"123456")
+    assert len(cache) == 0 and cache.size == 0
+
+
+def test_cached_loader_bookkeeping_is_trimmed_on_eviction():
+    async def main():
+        loader = CachedLoader(max_bytes=10)
+        for i in range(1000):
+            await loader.get(str(i), lambda: _value(b"x" * 10))
+        return loader
+
+    loader = asyncio.run(main())
+    assert len(loader.cache) == 1
+    assert len(loader._variants) == 1
+    assert loader._versions == {} and loader._loading == {}
+
+
+def test_cached_loader_invalidate_drops_all_variants():
+    async def main():
+        loader = CachedLoader(max_bytes=1000)
+        await loader.get("p", lambda: _value(b"plain"))
+        await loader.get("p", lambda: _value(b"gz"), variant="gzip")
+        assert len(loader.cache) == 2
+        loader.invalidate("p")
+        return loader
+
+    loader = asyncio.run(main())
+    assert len(loader.cache) == 0 and loader._variants == {}
+
+
+def test_cached_loader_does_not_cache_result_invalidated_mid_load():
+    async def main():
+        loader = CachedLoader(max_bytes=1000)
+
+        async def slow():
+            await asyncio.sleep(0.01)
+            return b"old"
+
+        task = asyncio.create_task(loader.get("p", slow))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        loader.invalidate("p")
+        assert await task == b"old"
+        return await loader.get("p", lambda: _value(b"new"))
+
+    assert asyncio.run(main()) == b"new"
+
+
+async def _value(value: bytes) -> bytes:
+    return value
@@ -0,0 +1,76 @@
+import pytest
+
+import utils.denylist
+from utils.denylist import SharedTokenDenylist, TokenDenylist
+from utils.shared import SharedIndex
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(1_000_000.5)
+    monkeypatch.setattr(utils.denylist.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "shared"])
+def denylist(request, tmp_path, clock):
+    if request.param == "memory":
+        return TokenDenylist()
+    return SharedTokenDenylist(SharedIndex(str(tmp_path / "shared_index.db")))
+
+
+def test_revoked_jti_expires_with_the_token(denylist, clock):
+    denylist.revoke("a", clock.now + 10)
+    assert denylist.is_revoked({"jti": "a"})
+    assert not denylist.is_revoked({"jti": "b"})
+    clock.now += 11
+    assert not denylist.is_revoked({"jti": "a"})
+
+
+def test_already_expired_token_is_not_stored(denylist, clock):
+    denylist.revoke("a", clock.now - 1)
+    assert not denylist.is_revoked({"jti": "a"})
+
+
+def test_subject_revocation_covers_tokens_issued_in_the_same_second(denylist, clock):
+    denylist.revoke_subject("a@x.com", ttl_seconds=60)
+    issued_before = int(clock.now) - 1
+    issued_same_second = int(clock.now)
+    assert denylist.is_revoked({"sub": "a@x.com", "iat": issued_before})
+    assert denylist.is_revoked({"sub": "a@x.com", "iat": issued_same_second})
+    assert not denylist.is_revoked({"sub": "a@x.com", "iat": issued_same_second + 1})
+    assert not denylist.is_revoked({"sub": "b@x.com", "iat": issued_before})
+    clock.now += 61
+    assert not denylist.is_revoked({"sub": "a@x.com", "iat": issued_before})
+
+
+def test_subject_revocation_follows_auth_time_across_refreshes(denylist, clock):
+    logged_in = int(clock.now)
+    denylist.revoke_subject("a@x.com", ttl_seconds=60)
+    # 무효화 뒤에 refresh 로 받은 토큰이라도 그 전에 로그인한 세션이면 거절
+    assert denylist.is_revoked({"sub": "a@x.com", "iat": logged_in + 5, "auth_time": logged_in})
+    assert not denylist.is_revoked({"sub": "a@x.com", "iat": logged_in + 5, "auth_time": logged_in + 5})
+
+
+def test_memory_denylist_purges_expired_entries(clock):
+    denylist = TokenDenylist()
+    denylist.revoke("a", clock.now + 10)
+    denylist.revoke_subject("a@x.com", ttl_seconds=20)
+    assert len(denylist) == 2
+    clock.now += 30
+    denylist.is_revoked({"jti": "x"})
+    assert len(denylist) == 0
+
+
+def test_shared_denylist_is_visible_to_other_instances(tmp_path, clock):
+    path = str(tmp_path / "shared_index.db")
+    SharedTokenDenylist(SharedIndex(path)).revoke("a", clock.now + 10)
+    assert SharedTokenDenylist(SharedIndex(path)).is_revoked({"jti": "a"})
@@ -0,0 +1,138 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from utils.feed import LIKE_THRESHOLD, TIMELINE_SIZE, VELOCITY_WINDOW, FeedService
+
+
+class DictStore:
+    def __init__(self):
+        self.posts = {}
+
+    def iter_latest(self):
+        return reversed(list(self.posts.values()))
+
+    def get(self, post_id):
+        return self.posts.get(post_id)
+
+
+def add_posts(store, feed, n, start=0):
+    base = datetime.now(timezone.utc) - timedelta(days=1)
+    for i in range(start, start + n):
+        post = {"post_id": str(i), "created_at": (base + timedelta(seconds=i)).isoformat()}
+        store.posts[post["post_id"]] = post
+        feed.on_post(post)
+
+
+def test_created_times_stay_bounded():
+    store = DictStore()
+    feed = FeedService(store)
+    feed.read("a@x.com", 1, 20)
+    add_posts(store, feed, TIMELINE_SIZE * 10)
+    assert len(feed._created) <= 2 * TIMELINE_SIZE + 1
+    # 타임라인에 들어 있는 글의 작성 시각은 남아 있다
+    assert set(feed.timelines["a@x.com"].scores) <= set(feed._created)
+
+
+def test_like_on_pruned_post_reads_created_at_from_store():
+    store = DictStore()
+    feed = FeedService(store)
+    add_posts(store, feed, TIMELINE_SIZE * 3)
+    assert "0" not in feed._created
+    feed.read("a@x.com", 1, 20)
+    for _ in range(LIKE_THRESHOLD):
+        feed.on_like("0")
+    assert "0" in feed._created
+    assert "0" in feed.timelines["a@x.com"].scores
+
+
+def make_post(post_id, created_at, author="w@x.com"):
+    return {"post_id": post_id, "title": post_id, "content": "", "author_email": author,
+            "created_at": created_at.isoformat()}
+
+
+def test_liked_posts_outrank_newer_posts_and_own_posts_are_excluded():
+    store = DictStore()
+    feed = FeedService(store)
+    feed.read("a@x.com", 1, 20)
+    now = datetime.now(timezone.utc)
+    for post in (make_post("old", now - timedelta(minutes=30)), make_post("new", now),
+                 make_post("mine", now + timedelta(seconds=1), author="a@x.com")):
+        store.posts[post["post_id"]] = post
+        feed.on_post(post)
+    assert feed.read("a@x.com", 1, 20)[0] == ["new", "old"]
+    for _ in range(LIKE_THRESHOLD):
+        feed.on_like("old")
+    assert feed.read("a@x.com", 1, 20)[0] == ["old", "new"]
+
+
+def test_fan_out_happens_only_when_likes_cross_the_threshold():
+    store = DictStore()
+    feed = FeedService(store)
+    for email in ("a@x.com", "b@x.com"):
+        feed.read(email, 1, 20)
+    add_posts(store, feed, 1)
+    feed.fanout_writes = 0
+    for _ in range(LIKE_THRESHOLD - 1):
+        feed.on_like("0")
+    assert feed.fanout_writes == 0
+    feed.on_like("0")
+    assert feed.fanout_writes == 2
+
+
+def test_liking_hides_the_post_and_boosts_the_author():
+    store = DictStore()
+    feed = FeedService(store)
+    feed.read("a@x.com", 1, 20)
+    now = datetime.now(timezone.utc)
+    for post in (make_post("liked", now - timedelta(minutes=2), author="fav@x.com"),
+                 make_post("fav", now - timedelta(minutes=1), author="fav@x.com"),
+                 make_post("other", now, author="other@x.com")):
+        store.posts[post["post_id"]] = post
+        feed.on_post(post)
+    feed.on_like("liked", "a@x.com")
+    timeline = feed.timelines["a@x.com"]
+    assert "liked" not in timeline.scores and timeline.affinity == {"fav@x.com": 1}
+    # 친밀도는 이후에 들어오는 글부터 반영된다
+    newer = make_post("fav2", now + timedelta(seconds=1), author="fav@x.com")
+    store.posts["fav2"] = newer
+    feed.on_post(newer)
+    assert feed.timelines["a@x.com"].page(1, 20)[0] == "fav2"
+    assert timeline.scores["fav2"] - timeline.scores["other"] > 1
+    # 다시 좋아요 fan-out 이 일어나도 숨긴 글은 돌아오지 않는다
+    for _ in range(LIKE_THRESHOLD):
+        feed.on_like("liked")
+    assert "liked" not in timeline.scores
+
+
+def test_boost_decays_after_the_velocity_window(monkeypatch):
+    store = DictStore()
+    feed = FeedService(store)
+    feed.read("a@x.com", 1, 20)
+    now = datetime.now(timezone.utc)
+    for post in (make_post("old", now - timedelta(minutes=30)), make_post("new", now)):
+        store.posts[post["post_id"]] = post
+        feed.on_post(post)
+    for _ in range(LIKE_THRESHOLD):
+        feed.on_like("old")
+    assert feed.read("a@x.com", 1, 20)[0] == ["old", "new"]
+    later = time.time() + VELOCITY_WINDOW + 1
+    monkeypatch.setattr("utils.feed.time.time", lambda: later)
+    assert feed.read("a@x.com", 1, 20)[0] == ["new", "old"]
+    assert "old" not in feed._boosted
+
+
+def test_inactive_user_timeline_merges_the_global_index():
+    store = DictStore()
+    liked = {"b@x.com": {"2"}}
+    feed = FeedService(store, liked=lambda post_ids, email: liked.get(email, set()) & set(post_ids))
+    now = datetime.now(timezone.utc)
+    for i in range(5):
+        post = make_post(str(i), now - timedelta(minutes=10 - i), author="b@x.com" if i == 4 else "w@x.com")
+        store.posts[post["post_id"]] = post
+        feed.on_post(post)  # 아직 아무도 active 가 아니므로 fan-out 되지 않는다
+    assert feed.fanout_writes == 0
+    for _ in range(LIKE_THRESHOLD):
+        feed.on_like("0")
+    post_ids, total = feed.read("b@x.com", 1, 20)
+    # 좋아요 속도가 붙은 "0" 이 맨 앞, 내 글 "4" 와 이미 좋아요한 "2" 는 빠진다
+    assert post_ids == ["0", "3", "1"] and total == 3
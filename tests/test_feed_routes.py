@@ -0,0 +1,41 @@
+import asyncio
+
+import main
+from routers.auth import issue_tokens
+from utils.feed import LIKE_THRESHOLD, FeedService
+from utils.partition import PartitionedStore, write_partitions
+from utils.records import IdMap, PostCodec
+
+
+class DuplicateLikes:
+    """이미 좋아요가 있어서 add_like 가 항상 False 를 돌려주는 공유 인덱스"""
+
+    def add_like(self, post_id, author_email, created_at):
+        return False
+
+
+def test_duplicate_like_does_not_count_towards_velocity(monkeypatch):
+    feed = FeedService(None)
+    monkeypatch.setattr(main, "feed", feed)
+    monkeypatch.setattr(main, "shared_index", DuplicateLikes())
+    for _ in range(LIKE_THRESHOLD):
+        asyncio.run(main.post_like("1", "Bearer x"))
+    assert "1" not in feed._likes
+
+
+def test_feed_total_matches_data_when_posts_are_missing(tmp_path, monkeypatch):
+    posts = [{"post_id": str(i), "title": str(i), "content": "", "author_email": "w@x.com",
+              "created_at": f"2026-01-0{i + 1}T00:00:00"} for i in range(3)]
+    write_partitions(posts, str(tmp_path / "posts"), "post_id")
+    store = PartitionedStore("posts", PostCodec(IdMap()), str(tmp_path))
+    feed = FeedService(store)
+    monkeypatch.setattr(main, "post_store", store)
+    monkeypatch.setattr(main, "feed", feed)
+    monkeypatch.setattr(main, "load_nicknames", lambda: {})
+    token = issue_tokens("reader@x.com")["data"]["access_token"]
+    feed.read("reader@x.com", 1, 20)
+    # 다른 경로로 저장소에서만 지워진 글
+    store.delete("2")
+    result = asyncio.run(main.get_user_feed(f"Bearer {token}", page=1, limit=20))
+    assert [p["post_id"] for p in result["data"]] == ["1", "0"]
+    assert result["pagination"]["total"] == 2
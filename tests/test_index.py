@@ -0,0 +1,32 @@
+import utils.index
+from utils.data import load_data, save_data
+from utils.index import build_indexes, load_nicknames
+
+
+def test_posts_latest_orders_mixed_offsets_in_utc():
+    posts = [
+        {"post_id": "kst", "author_email": "a@x.com", "created_at": "2026-01-07T08:30:00+09:00"},
+        {"post_id": "utc", "author_email": "a@x.com", "created_at": "2026-01-07T00:00:00Z"},
+    ]
+    assert build_indexes(posts, [], [])["posts_latest"] == ["utc", "kst"]
+
+
+def test_load_nicknames_rereads_only_after_users_change(tmp_path, monkeypatch):
+    reads = []
+
+    def counting_load(filename):
+        reads.append(filename)
+        return load_data(filename, str(tmp_path))
+
+    monkeypatch.setattr(utils.index, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(utils.index, "load_data", counting_load)
+    monkeypatch.setattr(utils.index, "_cached", {})
+
+    save_data([{"email": "a@x.com", "nickname": "에이"}], "users.json", str(tmp_path))
+    assert load_nicknames() == {"a@x.com": "에이"}
+    assert load_nicknames() == {"a@x.com": "에이"}
+    assert reads == ["users.json"]
+
+    save_data([{"email": "a@x.com", "nickname": "비"}], "users.json", str(tmp_path))
+    assert load_nicknames() == {"a@x.com": "비"}
+    assert len(reads) == 2
@@ -0,0 +1,81 @@
+import json
+import os
+
+import pytest
+
+from utils.data import load_data, save_data
+from utils.index import INDEX_FILE
+from utils.integrity import IntegrityChecker, iter_json_array
+from utils.partition import MANIFEST_FILE
+
+RECORDS = [
+    {"post_id": str(i), "title": "제목 [괄호], \"따옴표\"", "tags": [i, {"n": i}]}
+    for i in range(30)
+]
+
+
+def write(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 4096])
+def test_iter_json_array_across_chunk_boundaries(tmp_path, chunk_size):
+    path = tmp_path / "posts.json"
+    write(path, RECORDS)
+    assert list(iter_json_array(str(path), chunk_size)) == RECORDS
+
+
+@pytest.mark.parametrize("content", ["", "[]", "  [ \n ]  "])
+def test_iter_json_array_empty(tmp_path, content):
+    path = tmp_path / "posts.json"
+    path.write_text(content, encoding="utf-8")
+    assert list(iter_json_array(str(path), 2)) == []
+
+
+def test_iter_json_array_missing_file(tmp_path):
+    assert list(iter_json_array(str(tmp_path / "none.json"))) == []
+
+
+def test_iter_json_array_truncated_file_raises(tmp_path):
+    path = tmp_path / "posts.json"
+    path.write_text('[{"post_id": "1"}, {"post_id": ', encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(str(path), 4))
+
+
+def test_save_data_replaces_file_without_leftovers(tmp_path):
+    save_data([1, 2], "a.json", str(tmp_path))
+    save_data({"x": "한글"}, "a.json", str(tmp_path))
+    assert load_data("a.json", str(tmp_path)) == {"x": "한글"}
+    assert os.listdir(tmp_path) == ["a.json"]
+
+
+def test_malformed_records_are_counted_and_skipped(tmp_path):
+    write(tmp_path / "users.json", [{"email": "a@x.com"}, {"nickname": "no-email"}])
+    write(tmp_path / "posts.json", [
+        {"post_id": "1", "author_email": "a@x.com", "created_at": "2026-01-01T00:00:00"},
+        {"post_id": "2"},
+        "not a record",
+    ])
+    write(tmp_path / "likes.json", [{"post_id": "1"}, {"post_id": "1", "author_email": "a@x.com"}])
+
+    report = IntegrityChecker(str(tmp_path), repair=True).run()
+
+    assert report["orphans"]["malformed_records"] == 4
+    assert report["counts"]["likes"] == 2
+    assert load_data(INDEX_FILE, str(tmp_path))["likes_by_post"] == {"1": ["a@x.com"]}
+
+
+def test_background_mode_reports_manifest_drift_without_rewriting(tmp_path):
+    part_dir = tmp_path / "posts"
+    part_dir.mkdir()
+    write(part_dir / "2026-01.json", [{"post_id": "1", "author_email": "a@x.com", "created_at": "2026-01-01T00:00:00"}])
+    write(part_dir / MANIFEST_FILE, {"2026-01": 5})
+
+    report = IntegrityChecker(str(tmp_path), repair=True, repair_manifest=False).run()
+    assert report["drift"]["manifest"]["posts"] == {"2026-01": {"manifest": 5, "actual": 1}}
+    assert load_data(MANIFEST_FILE, str(part_dir)) == {"2026-01": 5}
+
+    IntegrityChecker(str(tmp_path), repair=True).run()
+    assert load_data(MANIFEST_FILE, str(part_dir)) == {"2026-01": 1}
@@ -0,0 +1,103 @@
+from utils.partition import IDS_FILE, PartitionedStore, load_id_log, write_partitions
+from utils.records import IdMap, PostCodec, PostRecord
+
+
+def post(post_id, created_at):
+    return {"post_id": post_id, "title": post_id, "content": "", "author_email": "a@x.com", "created_at": created_at}
+
+
+def make_store(tmp_path, **kwargs):
+    records = [post(f"{m}-{i}", f"2026-{m:02d}-{i + 1:02d}T00:00:00") for m in range(1, 7) for i in range(3)]
+    write_partitions(records, str(tmp_path / "posts"), "post_id")
+    return PartitionedStore("posts", PostCodec(IdMap()), str(tmp_path), **kwargs)
+
+
+def loaded(store):
+    return set(store._hot) | set(store._cold)
+
+
+def test_get_many_reads_only_partitions_holding_the_ids(tmp_path):
+    store = make_store(tmp_path, hot_partitions=1)
+    found = store.get_many(["2-0", "2-2", "missing"])
+    assert set(found) == {"2-0", "2-2"}
+    assert loaded(store) == {"2026-02"}
+
+
+def test_missing_id_does_not_scan_partitions(tmp_path):
+    store = make_store(tmp_path, hot_partitions=1)
+    assert store.get("missing") is None
+    assert store.update("missing", {"title": "x"}) is None
+    assert loaded(store) == set()
+
+
+def test_id_map_follows_add_and_delete(tmp_path):
+    store = make_store(tmp_path)
+    store.add(post("new", "2026-07-01T00:00:00"))
+    assert store.delete("1-0")["post_id"] == "1-0"
+    ids, _ = load_id_log(str(tmp_path / "posts"))
+    assert ids["new"] == "2026-07" and "1-0" not in ids
+    reopened = PartitionedStore("posts", PostCodec(IdMap()), str(tmp_path))
+    assert reopened.get("new")["created_at"] == "2026-07-01T00:00:00+00:00"
+    assert reopened.get("1-0") is None
+
+
+def test_id_map_is_built_once_for_older_data(tmp_path):
+    store = make_store(tmp_path)
+    (tmp_path / "posts" / IDS_FILE).unlink()
+    reopened = PartitionedStore("posts", PostCodec(IdMap()), str(tmp_path))
+    assert reopened.get("3-1")["post_id"] == "3-1"
+    assert len(load_id_log(str(tmp_path / "posts"))[0]) == len(store)
+
+
+def test_id_log_appends_per_write_and_compacts(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.partition.IDS_COMPACT_SLACK", 4)
+    store = make_store(tmp_path)
+    log = tmp_path / "posts" / IDS_FILE
+    before = log.read_text(encoding="utf-8")
+    store.add(post("new", "2026-07-01T00:00:00"))
+    # 기존 줄은 그대로 두고 한 줄만 붙는다
+    assert log.read_text(encoding="utf-8").startswith(before)
+    assert log.read_text(encoding="utf-8").count("\n") == before.count("\n") + 1
+    live = len(store)
+    for i in range(live + 5):
+        store.add(post(f"tmp-{i}", "2026-07-02T00:00:00"))
+        store.delete(f"tmp-{i}")
+    ids, lines = load_id_log(str(tmp_path / "posts"))
+    assert len(ids) == live and lines <= 2 * live + 4
+
+
+def test_page_latest_skips_partitions_by_manifest_counts(tmp_path):
+    store = make_store(tmp_path, hot_partitions=1)
+    page = store.page_latest(page=3, limit=4)
+    # 최신순 18건 중 9~12번째: 2026-04 의 마지막 1건 + 2026-03 의 3건
+    assert [p["post_id"] for p in page] == ["4-0", "3-2", "3-1", "3-0"]
+    assert loaded(store) == {"2026-04", "2026-03"}
+
+
+def test_page_latest_past_the_end_is_empty(tmp_path):
+    store = make_store(tmp_path)
+    assert store.page_latest(page=10, limit=5) == []
+
+
+def test_mixed_offsets_are_partitioned_and_sorted_in_utc(tmp_path):
+    store = PartitionedStore("posts", PostCodec(IdMap()), str(tmp_path))
+    # 한국 시간 2월 1일 오전 8시 = UTC 1월 31일 23시
+    store.add(post("kst", "2026-02-01T08:00:00+09:00"))
+    store.add(post("utc", "2026-01-31T23:30:00Z"))
+    store.add(post("feb", "2026-02-01T00:00:00Z"))
+    assert store.months() == ["2026-02", "2026-01"]
+    assert [p["post_id"] for p in store.iter_latest()] == ["feb", "utc", "kst"]
+
+
+def test_segments_hold_compact_records_and_return_dicts(tmp_path):
+    store = make_store(tmp_path)
+    assert store.get("6-0")["title"] == "6-0"
+    seg = store.segment("2026-06")
+    assert all(isinstance(r, PostRecord) for r in seg.records)
+    assert store.update("6-0", {"title": "new"})["title"] == "new"
+    assert PartitionedStore("posts", PostCodec(IdMap()), str(tmp_path)).get("6-0")["title"] == "new"
+
+
+def test_search_matches_compact_record_fields(tmp_path):
+    store = make_store(tmp_path)
+    assert [p["post_id"] for p in store.search("5-", page=1, limit=2)] == ["5-2", "5-1"]
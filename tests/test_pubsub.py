@@ -0,0 +1,111 @@
+import asyncio
+import json
+import time
+import tracemalloc
+
+import pytest
+from fastapi import HTTPException
+
+import main
+from routers.auth import issue_tokens
+from utils.partition import PartitionedStore, write_partitions
+from utils.pubsub import PostEventHub
+from utils.records import CommentCodec, IdMap
+
+
+def test_slow_subscriber_drops_oldest_and_gets_one_resync():
+    async def scenario():
+        hub = PostEventHub(queue_size=2)
+        stream = hub.stream("1")
+        assert await stream.__anext__() == "retry: 3000\n\n"
+        for i in range(5):
+            hub.publish("1", "like_created", {"n": i})
+        first = await stream.__anext__()
+        second = await stream.__anext__()
+        third = await stream.__anext__()
+        await stream.aclose()
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first == f"event: resync\ndata: {json.dumps({'dropped': 3})}\n\n"
+    # 버려진 것은 오래된 이벤트이고 최신 두 개는 남는다
+    assert second == 'event: like_created\ndata: {"n": 3}\n\n'
+    assert third == 'event: like_created\ndata: {"n": 4}\n\n'
+
+
+def test_closing_the_stream_unsubscribes():
+    async def scenario():
+        hub = PostEventHub()
+        stream = hub.stream("1")
+        await stream.__anext__()
+        assert hub.subscriber_count("1") == 1
+        await stream.aclose()
+        return hub
+
+    hub = asyncio.run(scenario())
+    assert hub.subscriber_count() == 0 and hub._subscribers == {}
+
+
+def test_ten_thousand_idle_subscribers_stay_cheap():
+    n = 10_000
+
+    async def consume(hub, post_id):
+        async for _ in hub.stream(post_id, heartbeat=60):
+            pass
+
+    async def scenario():
+        hub = PostEventHub()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        tasks = [asyncio.create_task(consume(hub, str(i % 100))) for i in range(n)]
+        while hub.subscriber_count() < n:
+            await asyncio.sleep(0)
+        per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / n
+        tracemalloc.stop()
+        start = time.perf_counter()
+        hub.publish("0", "like_created", {"post_id": "0"})
+        publish_seconds = time.perf_counter() - start
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return hub, per_subscriber, publish_seconds
+
+    hub, per_subscriber, publish_seconds = asyncio.run(scenario())
+    # 대기 중인 구독자는 태스크 + 큐 + 타이머 정도만 차지한다
+    assert per_subscriber < 16 * 1024
+    # 한 게시글(구독자 100명)에 발행하는 비용은 다른 게시글 구독자 수와 무관하다
+    assert publish_seconds < 0.05
+    assert hub.subscriber_count() == 0
+
+
+@pytest.fixture
+def comments(tmp_path, monkeypatch):
+    records = [{"comment_id": "c1", "post_id": "p1", "author_email": "a@x.com", "content": "hi",
+                "created_at": "2026-01-01T00:00:00"}]
+    write_partitions(records, str(tmp_path / "comments"), "comment_id")
+    store = PartitionedStore("comments", CommentCodec(IdMap()), str(tmp_path))
+    monkeypatch.setattr(main, "comment_store", store)
+    hub = PostEventHub()
+    monkeypatch.setattr(main, "hub", hub)
+    return store, hub
+
+
+def test_delete_comment_publishes_to_the_comment_post(comments):
+    store, hub = comments
+    sub = hub.subscribe("p1")
+    token = issue_tokens("a@x.com")["data"]["access_token"]
+    response = asyncio.run(main.delete_comment("c1", f"Bearer {token}"))
+    assert response.status_code == 204
+    assert store.get("c1") is None
+    event, data = sub.queue.get_nowait()
+    assert event == "comment_deleted" and json.loads(data) == {"comment_id": "c1", "post_id": "p1"}
+
+
+def test_delete_comment_rejects_other_users_and_missing_comments(comments):
+    store, hub = comments
+    token = issue_tokens("b@x.com")["data"]["access_token"]
+    for comment_id, status_code in (("c1", 403), ("missing", 404)):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(main.delete_comment(comment_id, f"Bearer {token}"))
+        assert exc.value.status_code == status_code
+    assert store.get("c1") is not None
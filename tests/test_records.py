@@ -0,0 +1,38 @@
+from utils.records import (
+    CommentCodec, CommentRecord, IdMap, PostCodec, PostRecord, from_epoch, intern_user, to_epoch,
+)
+
+
+def test_post_round_trip_uses_compact_fields():
+    ids = IdMap()
+    codec = PostCodec(ids)
+    record = codec.from_dict({
+        "post_id": "p1", "title": "t", "content": "c",
+        "author_email": "".join(["a@", "x.com"]), "created_at": "2026-01-07T08:30:00+09:00",
+    })
+    assert isinstance(record, PostRecord) and not hasattr(record, "__dict__")
+    assert record.pid == 0 and record.created_at == to_epoch("2026-01-06T23:30:00Z")
+    assert record.author_email is intern_user({"email": "a@x.com", "nickname": "n"})["email"]
+    assert codec.to_dict(record) == {
+        "post_id": "p1", "title": "t", "content": "c",
+        "author_email": "a@x.com", "created_at": "2026-01-06T23:30:00+00:00",
+    }
+
+
+def test_comments_share_post_int_ids():
+    ids = IdMap()
+    post = PostCodec(ids).from_dict({
+        "post_id": "p1", "title": "t", "content": "c", "author_email": "a@x.com", "created_at": "2026-01-01T00:00:00Z",
+    })
+    comment = CommentCodec(ids).from_dict({
+        "comment_id": "c1", "post_id": "p1", "author_email": "a@x.com", "content": "hi",
+        "created_at": "2026-01-01T00:00:00Z",
+    })
+    assert isinstance(comment, CommentRecord)
+    assert comment.pid == post.pid
+    assert comment.updated_at == comment.created_at
+    assert CommentCodec(ids).record_id(comment) == "c1"
+
+
+def test_epoch_round_trip():
+    assert from_epoch(to_epoch("2026-01-04T12:00:00Z")) == "2026-01-04T12:00:00+00:00"
@@ -0,0 +1,38 @@
+import pytest
+
+from utils.data import load_data
+from utils.index import INDEX_FILE
+from utils.seed import main
+
+
+def write_lines(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_seeding_likes_later_keeps_post_indexes(tmp_path):
+    data_dir = tmp_path / "data"
+    posts = write_lines(tmp_path / "posts.csv", [
+        "post_id,title,content,author_email,created_at",
+        "1,a,b,a@x.com,2026-01-01T00:00:00",
+        "2,c,d,a@x.com,2026-02-01T00:00:00",
+    ])
+    likes = write_lines(tmp_path / "likes.ndjson", ['{"post_id": "1", "author_email": "b@x.com"}'])
+
+    main(["--posts", posts, "--data-dir", str(data_dir)])
+    main(["--likes", likes, "--data-dir", str(data_dir)])
+
+    indexes = load_data(INDEX_FILE, str(data_dir))
+    assert indexes["posts_latest"] == ["2", "1"]
+    assert indexes["likes_by_post"] == {"1": ["b@x.com"]}
+
+
+def test_seeding_into_non_empty_collection_is_refused(tmp_path):
+    data_dir = tmp_path / "data"
+    posts = write_lines(tmp_path / "posts.ndjson", [
+        '{"post_id": "1", "title": "a", "content": "b", "author_email": "a@x.com", "created_at": "2026-01-01T00:00:00"}',
+    ])
+    main(["--posts", posts, "--data-dir", str(data_dir)])
+    with pytest.raises(SystemExit):
+        main(["--posts", posts, "--data-dir", str(data_dir)])
+    assert len(load_data("2026-01.json", str(data_dir / "posts"))) == 1
@@ -0,0 +1,22 @@
+from utils.shared import SharedIndex
+
+
+def test_like_status_many_uses_and_fills_the_local_cache(tmp_path):
+    index = SharedIndex(str(tmp_path / "shared_index.db"))
+    index.add_like("1", "a@x.com", "2026-01-01T00:00:00Z")
+    index.add_like("1", "b@x.com", "2026-01-01T00:00:00Z")
+
+    assert index.like_status("1", "a@x.com") == (2, True)
+    assert index.like_status_many(["2", "1"], "a@x.com") == {"2": (0, False), "1": (2, True)}
+    assert index._cache[("2", "a@x.com")] == (0, False)
+
+
+def test_writes_from_another_worker_invalidate_the_cache(tmp_path):
+    path = str(tmp_path / "shared_index.db")
+    reader = SharedIndex(path)
+    writer = SharedIndex(path)
+    assert reader.like_status_many(["1"], "a@x.com") == {"1": (0, False)}
+    writer.add_like("1", "a@x.com", "2026-01-01T00:00:00Z")
+    assert reader.like_status_many(["1"], "a@x.com") == {"1": (1, True)}
+    writer.remove_like("1", "a@x.com")
+    assert reader.like_status("1", "a@x.com") == (0, False)
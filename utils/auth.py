@@ -1,36 +1,121 @@
 import bcrypt
+import json
+import math
 import os
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from dotenv import load_dotenv
+from utils.denylist import denylist
+from utils.data import DATA_DIR, load_data
 
 load_dotenv()
 
 SECRET_KEY = os.getenv('SECRET_KEY')
 ALGORITHM = os.getenv('ALGORITHM')
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES'))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv('REFRESH_TOKEN_EXPIRE_DAYS', '14'))
 
-def create_access_token(data: dict):
-    """사용자 정보(Payload)를 담은 JWT 토큰 생성"""
+# bcrypt cost: BCRYPT_ROUNDS 를 주면 그 값을 쓰고, 없으면 처음 한 번만
+# 해시 한 번이 BCRYPT_TARGET_MS 정도 걸리도록 측정해서 data/bcrypt_cost.json 에 기록한다.
+# 이후에는 모든 워커/재시작이 그 파일의 값을 그대로 쓴다. (측정값은 실행마다 흔들리므로)
+BCRYPT_COST_FILE = "bcrypt_cost.json"
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+BCRYPT_TARGET_MS = float(os.getenv('BCRYPT_TARGET_MS', '250'))
+bcrypt_rounds = int(os.getenv('BCRYPT_ROUNDS', '12'))
+
+def _create_token(data: dict, token_type: str, expires_delta: timedelta):
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({'exp': expire})
+    now = datetime.now(timezone.utc)
+    # jti: 토큰마다 고유한 ID (denylist 에서 이 값으로 무효화)
+    to_encode.update({'iat': now, 'exp': now + expires_delta, 'jti': uuid.uuid4().hex, 'type': token_type})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def decode_access_token(token: str):
-    """토큰을 해석하여 사용자 정보를 반환"""
+def create_access_token(data: dict):
+    """사용자 정보(Payload)를 담은 JWT 토큰 생성"""
+    return _create_token(data, 'access', timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+
+def create_refresh_token(data: dict):
+    """access token 재발급에 사용하는 refresh token 생성"""
+    return _create_token(data, 'refresh', timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+
+def _decode_token(token: str, token_type: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        return payload
     except JWTError:
         return None
+    if payload.get('type', 'access') != token_type or denylist.is_revoked(payload):
+        return None
+    return payload
+
+def decode_access_token(token: str):
+    """토큰을 해석하여 사용자 정보를 반환"""
+    return _decode_token(token, 'access')
+
+def decode_refresh_token(token: str):
+    """refresh token 을 해석하여 사용자 정보를 반환"""
+    return _decode_token(token, 'refresh')
+
+def revoke_token(payload: dict):
+    """토큰을 남은 수명 동안만 denylist 에 올려 무효화"""
+    denylist.revoke(payload['jti'], payload['exp'])
+
+def revoke_user_tokens(email: str):
+    """사용자에게 발급된 모든 토큰 무효화 (가장 긴 refresh token 수명만큼 기억)"""
+    denylist.revoke_subject(email, timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS).total_seconds())
+
+def calibrate_bcrypt_rounds(target_ms: float = BCRYPT_TARGET_MS) -> int:
+    """현재 CPU 에서 해시 한 번이 target_ms 에 가장 가깝게 걸리는 rounds 를 찾습니다."""
+    probe_rounds = 8
+    samples = []
+    for _ in range(5):
+        start = time.perf_counter()
+        bcrypt.hashpw(b'calibration', bcrypt.gensalt(rounds=probe_rounds))
+        samples.append((time.perf_counter() - start) * 1000)
+    elapsed_ms = sorted(samples)[len(samples) // 2]  # 중앙값
+    # rounds 가 1 늘어날 때마다 시간은 2배가 된다
+    rounds = probe_rounds + round(math.log2(target_ms / max(elapsed_ms, 0.001)))
+    return max(BCRYPT_MIN_ROUNDS, min(BCRYPT_MAX_ROUNDS, rounds))
+
+def configure_bcrypt_rounds(data_dir: str = DATA_DIR) -> int:
+    """서버 시작 시 호출: 사용할 bcrypt cost 를 정합니다."""
+    global bcrypt_rounds
+    if os.getenv('BCRYPT_ROUNDS') is not None:
+        return bcrypt_rounds
+    path = os.path.join(data_dir, BCRYPT_COST_FILE)
+    if not os.path.exists(path):
+        rounds = calibrate_bcrypt_rounds()
+        os.makedirs(data_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"rounds": rounds}, f)
+        try:
+            # 여러 워커가 동시에 측정해도 가장 먼저 link 한 값 하나만 남는다
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+    stored = load_data(BCRYPT_COST_FILE, data_dir)
+    if isinstance(stored, dict) and BCRYPT_MIN_ROUNDS <= stored.get("rounds", 0) <= BCRYPT_MAX_ROUNDS:
+        bcrypt_rounds = stored["rounds"]
+    return bcrypt_rounds
+
+def needs_rehash(hashed_password: str) -> bool:
+    """저장된 해시의 cost 가 현재 설정보다 낮으면 True ($2b$12$... 형식, 올리는 방향으로만 재해싱)"""
+    try:
+        return int(hashed_password.split('$')[2]) < bcrypt_rounds
+    except (IndexError, ValueError):
+        return False
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: int | None = None) -> str:
     """비밀번호를 안전하게 해싱합니다 (bcrypt 직접 사용)."""
     # 1. 입력받은 문자열 비밀번호를 바이트(bytes) 형태로 변환
     pwd_bytes = password.encode('utf-8')
     # 2. 솔트(Salt) 생성
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=rounds or bcrypt_rounds)
     # 3. 해싱 처리
     hashed_password = bcrypt.hashpw(pwd_bytes, salt)
     # 4. DB 저장을 위해 다시 문자열로 변환(decode)해서 반환
@@ -0,0 +1,160 @@
+# utils/cache.py
+# 인기 게시글 상세 조회용 캐시
+# - SingleFlight: 같은 키에 대한 동시 miss 는 로딩을 한 번만 하고 결과를 나눠 받는다.
+# - ByteLFUCache: 직렬화가 끝난 응답 본문(bytes)을 저장하는 LFU 캐시. 크기는 바이트 기준.
+import asyncio
+from collections import OrderedDict
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: dict = {}
+
+    async def do(self, key, loader):
+        """key 에 대한 로딩이 진행 중이면 그 결과를 기다리고, 아니면 loader() 를 실행합니다."""
+        task = self._inflight.get(key)
+        if task is None:
+            # 로딩은 별도 task 에서 실행한다. 처음 요청한 쪽이 취소(클라이언트 연결 끊김 등)되어도
+            # 함께 기다리던 다른 요청들은 결과를 그대로 받는다.
+            task = asyncio.ensure_future(loader())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 기다리는 쪽이 모두 취소됐으면 "exception was never retrieved" 경고가 나므로 한 번 꺼내 둔다
+            task.exception()
+
+
+class ByteLFUCache:
+    """
+    값(bytes)의 전체 크기가 max_bytes 를 넘지 않게 유지하는 LFU 캐시
+    사용 횟수별 버킷(OrderedDict)을 두어 get/set/evict 가 모두 O(1) 이다.
+    같은 횟수끼리는 가장 오래전에 쓰인 것부터 내보낸다.
+    """
+
+    def __init__(self, max_bytes: int, on_evict=None):
+        self.max_bytes = max_bytes
+        self.size = 0
+        # 용량 때문에 밀려난 key 를 알려 받을 콜백 (delete 로 지운 것은 알리지 않는다)
+        self._on_evict = on_evict
+        self._values: dict = {}   # key -> (value, freq)
+        self._buckets: dict[int, OrderedDict] = {}
+        self._min_freq = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def _touch(self, key, freq: int) -> int:
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+        return freq + 1
+
+    def get(self, key):
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, freq = entry
+        self._values[key] = (value, self._touch(key, freq))
+        return value
+
+    def set(self, key, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        self.delete(key)
+        while self.size + len(value) > self.max_bytes:
+            self._evict()
+        self._values[key] = (value, 1)
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_freq = 1
+        self.size += len(value)
+
+    def delete(self, key):
+        entry = self._values.pop(key, None)
+        if entry is None:
+            return
+        value, freq = entry
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+        self.size -= len(value)
+
+    def _evict(self):
+        while self._min_freq not in self._buckets:
+            self._min_freq += 1
+        key, _ = self._buckets[self._min_freq].popitem(last=False)
+        if not self._buckets[self._min_freq]:
+            del self._buckets[self._min_freq]
+        value, _ = self._values.pop(key)
+        self.size -= len(value)
+        if self._on_evict is not None:
+            self._on_evict(key)
+
+
+class CachedLoader:
+    """
+    ByteLFUCache 앞에 SingleFlight 를 둔 조회 계층
+    같은 key 에 대해 variant(예: gzip/br 압축본)별로 따로 저장할 수 있고,
+    invalidate(key) 는 그 key 의 모든 variant 를 함께 지운다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.cache = ByteLFUCache(max_bytes, on_evict=self._evicted)
+        self._flight = SingleFlight()
+        # 로딩 도중 무효화된 결과를 캐시에 넣지 않기 위한 키별 버전
+        # 로딩 중인 key 에 대해서만 유지하고, 마지막 로딩이 끝나면 지운다.
+        self._versions: dict = {}
+        self._loading: dict = {}
+        # key -> 캐시에 들어 있는 variant 집합 (캐시에 남아 있는 key 만 유지)
+        self._variants: dict = {}
+
+    def _evicted(self, cache_key):
+        key, variant = cache_key
+        variants = self._variants.get(key)
+        if variants is not None:
+            variants.discard(variant)
+            if not variants:
+                del self._variants[key]
+
+    async def get(self, key, loader, variant=None) -> bytes:
+        cache_key = (key, variant)
+        value = self.cache.get(cache_key)
+        if value is not None:
+            return value
+        version = self._versions.get(key, 0)
+
+        async def load():
+            self._loading[key] = self._loading.get(key, 0) + 1
+            try:
+                loaded = await loader()
+            finally:
+                stale = self._versions.get(key, 0) != version
+                self._loading[key] -= 1
+                if not self._loading[key]:
+                    del self._loading[key]
+                    self._versions.pop(key, None)
+            if not stale:
+                self.cache.set(cache_key, loaded)
+                if cache_key in self.cache:
+                    self._variants.setdefault(key, set()).add(variant)
+            return loaded
+
+        return await self._flight.do((cache_key, version), load)
+
+    def invalidate(self, key):
+        if key in self._loading:
+            self._versions[key] = self._versions.get(key, 0) + 1
+        for variant in self._variants.pop(key, ()):
+            self.cache.delete((key, variant))
@@ -0,0 +1,106 @@
+# utils/compression.py
+# 응답 압축 (gzip, brotli 패키지가 설치되어 있으면 br 도 사용)
+# - Accept-Encoding 을 보고 인코딩을 고른다.
+# - MINIMUM_SIZE 보다 작은 본문은 압축하지 않는다 (헤더 오버헤드가 더 큼).
+# - THREAD_THRESHOLD 보다 큰 본문은 이벤트 루프를 막지 않도록 스레드에서 압축한다.
+# - 스트리밍 응답(SSE 등)과 이미 Content-Encoding 이 붙은 응답은 그대로 통과시킨다.
+import gzip
+import os
+
+import anyio
+
+try:
+    import brotli
+except ImportError:  # brotli 는 선택 의존성
+    brotli = None
+
+MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "500"))
+THREAD_THRESHOLD = int(os.getenv("COMPRESSION_THREAD_THRESHOLD", str(64 * 1024)))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Accept-Encoding 헤더에서 사용할 인코딩을 고릅니다. 없으면 None"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    # 서버 선호 순서(br > gzip)대로, 클라이언트가 q=0 으로 거절하지 않은 첫 번째
+    for encoding in SUPPORTED_ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+async def compress_async(body: bytes, encoding: str) -> bytes:
+    """큰 본문은 워커 스레드에서 압축합니다."""
+    if len(body) >= THREAD_THRESHOLD:
+        return await anyio.to_thread.run_sync(compress, body, encoding)
+    return compress(body, encoding)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            response_headers = [(k, v) for k, v in start["headers"]]
+            names = {k.lower() for k, _ in response_headers}
+            if (message.get("more_body", False) or b"content-encoding" in names
+                    or len(body) < self.minimum_size):
+                # 스트리밍 응답, 이미 압축된 응답, 작은 응답은 그대로 보낸다
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await compress_async(body, encoding)
+            response_headers = [(k, v) for k, v in response_headers if k.lower() != b"content-length"]
+            response_headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send({**start, "headers": response_headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,27 +1,39 @@
 # utils/data.py
 import json
 import os
+import tempfile
 
 # 프로젝트 루트 기준 data 폴더 경로 설정
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 
 
-def load_data(filename: str):
+def load_data(filename: str, data_dir: str = DATA_DIR):
     """JSON 파일을 읽어오는 '가져오는 방법' 정의"""
-    file_path = os.path.join(DATA_DIR, filename)
+    file_path = os.path.join(data_dir, filename)
     if not os.path.exists(file_path):
         return []  # 파일이 없으면 빈 데이터 반환
 
     with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+        content = f.read()
+    if not content.strip():
+        return []  # 빈 파일도 빈 데이터로 취급
+    return json.loads(content)
 
 
-def save_data(data, filename: str):
+def save_data(data, filename: str, data_dir: str = DATA_DIR):
     """데이터를 파일에 기록하는 '담는 방법' 정의"""
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)  # data 폴더가 없으면 자동 생성
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)  # data 폴더가 없으면 자동 생성
 
-    file_path = os.path.join(DATA_DIR, filename)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    file_path = os.path.join(data_dir, filename)
+    # 같은 폴더의 임시 파일에 다 쓴 뒤 바꿔치기한다.
+    # 쓰는 도중에 죽거나 다른 프로세스가 읽어도 반쯤 쓰인 파일을 보지 않는다.
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{filename}.", suffix=".tmp", dir=data_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
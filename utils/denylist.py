@@ -0,0 +1,86 @@
+# utils/denylist.py
+# 발급된 토큰을 무효화하기 위한 denylist
+# 토큰은 만료 시각이 지나면 어차피 쓸 수 없으므로, 남은 수명만큼만 기억하면 된다.
+# - TokenDenylist: 프로세스 메모리. 조회는 dict 한 번이라 O(1), 만료된 항목은 heap 으로 조금씩 정리한다.
+# - SharedTokenDenylist: SHARED_INDEX=1 이면 공유 인덱스(SQLite)에 기록해서
+#   모든 워커가 같은 목록을 보고, 서버를 다시 띄워도 무효화가 유지된다.
+#
+# 사용자 단위 무효화(revoke_subject)는 그 시각(초 단위 int)까지 로그인해서 받은 토큰을 모두 거절한다.
+# - 토큰의 iat 는 초 단위로 잘려 있으므로 같은 초에 발급된 토큰도 거절한다 (iat <= revoked_at).
+# - refresh 로 새로 받은 토큰은 처음 로그인한 시각(auth_time)을 그대로 물려받으므로,
+#   무효화 전에 로그인한 세션은 무효화 뒤에 refresh 해서 받은 토큰까지 함께 거절된다.
+import heapq
+import time
+
+from utils.shared import shared_index
+
+
+def _logged_in_at(payload: dict) -> int:
+    """토큰을 발급받은 로그인 시각 (refresh 로 받은 토큰은 처음 로그인한 시각)"""
+    return payload.get("auth_time", payload.get("iat", 0))
+
+
+class TokenDenylist:
+    def __init__(self):
+        self._jtis: dict[str, float] = {}      # jti -> 토큰 만료 시각(epoch)
+        self._subjects: dict[str, tuple[int, float]] = {}  # sub -> (이 시각 이전 발급분 무효, 기억할 시각)
+        self._expiry: list[tuple[float, int, str]] = []  # (만료 시각, 종류, 키)
+
+    def __len__(self):
+        return len(self._jtis) + len(self._subjects)
+
+    def _purge(self, now: float):
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, kind, key = heapq.heappop(self._expiry)
+            if kind == 0:
+                if self._jtis.get(key) == expires_at:
+                    del self._jtis[key]
+            elif self._subjects.get(key, (0, None))[1] == expires_at:
+                del self._subjects[key]
+
+    def revoke(self, jti: str, expires_at: float):
+        """토큰 하나(jti)를 만료 시각까지 무효화합니다."""
+        now = time.time()
+        self._purge(now)
+        if expires_at <= now:
+            return
+        self._jtis[jti] = expires_at
+        heapq.heappush(self._expiry, (expires_at, 0, jti))
+
+    def revoke_subject(self, sub: str, ttl_seconds: float):
+        """지금까지 sub 에게 발급된 모든 토큰을 무효화합니다. (회원 탈퇴 등)"""
+        now = time.time()
+        self._purge(now)
+        expires_at = now + ttl_seconds
+        self._subjects[sub] = (int(now), expires_at)
+        heapq.heappush(self._expiry, (expires_at, 1, sub))
+
+    def is_revoked(self, payload: dict) -> bool:
+        now = time.time()
+        self._purge(now)
+        if payload.get("jti") in self._jtis:
+            return True
+        revoked = self._subjects.get(payload.get("sub"))
+        return revoked is not None and _logged_in_at(payload) <= revoked[0]
+
+
+class SharedTokenDenylist:
+    """TokenDenylist 와 같은 인터페이스로 공유 인덱스(SQLite)에 기록하는 denylist"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def revoke(self, jti: str, expires_at: float):
+        if expires_at > time.time():
+            self.index.revoke_jti(jti, expires_at)
+
+    def revoke_subject(self, sub: str, ttl_seconds: float):
+        now = time.time()
+        self.index.revoke_subject(sub, int(now), now + ttl_seconds)
+
+    def is_revoked(self, payload: dict) -> bool:
+        jti_revoked, revoked_at = self.index.revocation(payload.get("jti"), payload.get("sub"))
+        return jti_revoked or (revoked_at is not None and _logged_in_at(payload) <= revoked_at)
+
+
+denylist = SharedTokenDenylist(shared_index) if shared_index is not None else TokenDenylist()
@@ -0,0 +1,228 @@
+# utils/feed.py
+# 개인화 홈 피드 (fan-out-on-write)
+# 최근에 피드를 본 사용자(active)마다 점수순 타임라인을 최대 TIMELINE_SIZE 개까지 미리 만들어 둔다.
+# - 새 글이 올라오면 작성자 본인을 뺀 모든 active 사용자의 타임라인에 끼워 넣는다.
+# - 좋아요가 LIKE_THRESHOLD 개 쌓일 때마다 점수를 다시 계산해서 타임라인에 반영한다.
+#   좋아요가 VELOCITY_WINDOW 밖으로 빠져 단계가 내려가면 그 글이 들어 있는 타임라인의 점수도 낮춘다.
+# - 내가 좋아요한 글은 내 타임라인에서 빼고, 그 글 작성자에 대한 친밀도(affinity)를 올린다.
+# - 타임라인이 없는(비활성) 사용자는 전체 최신순 인덱스(post_store)에서 합쳐 만든다.
+#
+# 점수 = 작성 시각(epoch 초)
+#       + 마지막으로 반영된 좋아요 속도(LIKE_THRESHOLD 단위) * LIKE_BOOST_SECONDS
+#       + 작성자 친밀도(최대 AFFINITY_MAX) * AFFINITY_BOOST_SECONDS
+# (좋아요 1개가 글을 LIKE_BOOST_SECONDS 만큼 더 최근 글처럼 보이게 한다)
+import bisect
+import os
+import time
+from collections import deque
+
+from utils.records import to_epoch
+
+TIMELINE_SIZE = int(os.getenv("FEED_TIMELINE_SIZE", "300"))
+ACTIVE_SECONDS = int(os.getenv("FEED_ACTIVE_SECONDS", str(7 * 24 * 3600)))
+LIKE_THRESHOLD = int(os.getenv("FEED_LIKE_THRESHOLD", "5"))
+LIKE_BOOST_SECONDS = 600
+VELOCITY_WINDOW = 3600
+AFFINITY_BOOST_SECONDS = 300
+AFFINITY_MAX = 10
+AFFINITY_AUTHORS = 100
+
+
+def _author(post: dict) -> str | None:
+    """저장소 레코드는 author_email, API 응답 형태는 author.author_email 에 작성자가 있다."""
+    return post.get("author_email") or (post.get("author") or {}).get("author_email")
+
+
+class Timeline:
+    """점수 내림차순으로 (-score, post_id) 를 유지하는 크기 제한 목록"""
+    __slots__ = ("entries", "scores", "last_seen", "affinity", "hidden")
+
+    def __init__(self):
+        self.entries: list[tuple[float, str]] = []
+        self.scores: dict[str, float] = {}
+        self.last_seen = time.time()
+        # 작성자 -> 내가 그 작성자의 글에 누른 좋아요 수 (최대 AFFINITY_AUTHORS 명)
+        self.affinity: dict[str, int] = {}
+        # 내가 좋아요해서 다시 넣지 않을 글 (삽입 순서대로 최대 TIMELINE_SIZE 개)
+        self.hidden: dict[str, None] = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def upsert(self, post_id: str, score: float) -> bool:
+        """타임라인에 넣거나 점수를 바꿉니다. 실제로 들어갔으면 True"""
+        if post_id in self.hidden:
+            return False
+        old = self.scores.get(post_id)
+        if old is not None:
+            del self.entries[bisect.bisect_left(self.entries, (-old, post_id))]
+        elif len(self.entries) >= TIMELINE_SIZE and -score >= self.entries[-1][0]:
+            return False  # 가득 찼고 꼴찌보다도 점수가 낮음
+        bisect.insort(self.entries, (-score, post_id))
+        self.scores[post_id] = score
+        if len(self.entries) > TIMELINE_SIZE:
+            _, dropped = self.entries.pop()
+            del self.scores[dropped]
+        return True
+
+    def remove(self, post_id: str):
+        score = self.scores.pop(post_id, None)
+        if score is not None:
+            del self.entries[bisect.bisect_left(self.entries, (-score, post_id))]
+
+    def hide(self, post_id: str):
+        """이미 좋아요한 글: 타임라인에서 빼고 다시 들어오지 않게 한다."""
+        self.remove(post_id)
+        self.hidden[post_id] = None
+        if len(self.hidden) > TIMELINE_SIZE:
+            del self.hidden[next(iter(self.hidden))]
+
+    def like_author(self, author: str):
+        if author not in self.affinity and len(self.affinity) >= AFFINITY_AUTHORS:
+            del self.affinity[min(self.affinity, key=self.affinity.get)]
+        self.affinity[author] = min(self.affinity.get(author, 0) + 1, AFFINITY_MAX)
+
+    def page(self, page: int, limit: int) -> list[str]:
+        start = (page - 1) * limit
+        return [post_id for _, post_id in self.entries[start:start + limit]]
+
+
+class FeedService:
+    def __init__(self, post_store, liked=None):
+        self.post_store = post_store
+        # liked(post_ids, email) -> 그중 email 이 이미 좋아요한 post_id 집합 (타임라인을 새로 만들 때 사용)
+        self.liked = liked
+        self.timelines: dict[str, Timeline] = {}
+        # post_id -> (작성 시각(epoch), 작성자). 어떤 타임라인에 들어 있거나 최근 좋아요가 있는 글만 남긴다.
+        self._created: dict[str, tuple[int, str | None]] = {}
+        self._created_limit = TIMELINE_SIZE
+        self._likes: dict[str, deque] = {}         # post_id -> 최근 좋아요 시각들
+        self._boosted: dict[str, int] = {}         # post_id -> 점수에 반영된 좋아요 속도
+        # 쓰기 증폭 측정용: 지금까지 타임라인에 끼워 넣은 횟수
+        self.fanout_writes = 0
+
+    def _velocity(self, post_id: str, now: float) -> int:
+        likes = self._likes.get(post_id)
+        if not likes:
+            return 0
+        while likes and likes[0] < now - VELOCITY_WINDOW:
+            likes.popleft()
+        return len(likes)
+
+    def score(self, post_id: str, created_at: float, author: str | None = None,
+              timeline: Timeline | None = None) -> float:
+        score = created_at + self._boosted.get(post_id, 0) * LIKE_BOOST_SECONDS
+        if timeline is not None and author is not None:
+            score += timeline.affinity.get(author, 0) * AFFINITY_BOOST_SECONDS
+        return score
+
+    def _decay(self, now: float):
+        """좋아요가 창 밖으로 빠져 속도 단계가 내려간 글은 들어 있는 타임라인에서 점수를 낮춘다."""
+        for post_id, applied in list(self._boosted.items()):
+            velocity = self._velocity(post_id, now)
+            level = velocity - velocity % LIKE_THRESHOLD
+            if level >= applied:
+                continue
+            if level:
+                self._boosted[post_id] = level
+            else:
+                del self._boosted[post_id]
+            created_at, author = self._created.get(post_id, (None, None))
+            if created_at is None:
+                continue
+            for timeline in self.timelines.values():
+                if post_id in timeline.scores:
+                    timeline.upsert(post_id, self.score(post_id, created_at, author, timeline))
+
+    def _expire_inactive(self, now: float):
+        self._decay(now)
+        for email in [e for e, t in self.timelines.items() if t.last_seen < now - ACTIVE_SECONDS]:
+            del self.timelines[email]
+        for post_id in [p for p, likes in self._likes.items() if not likes or likes[-1] < now - VELOCITY_WINDOW]:
+            del self._likes[post_id]
+        if len(self._created) > self._created_limit:
+            self._prune_created()
+
+    def _prune_created(self):
+        """타임라인에도 없고 최근 좋아요도 없는 글의 작성 정보는 버린다. (필요하면 post_store 에서 다시 읽음)"""
+        live = set(self._likes)
+        for timeline in self.timelines.values():
+            live.update(timeline.scores)
+        self._created = {p: c for p, c in self._created.items() if p in live}
+        # 남은 것의 두 배가 될 때까지는 다시 정리하지 않는다 (정리 비용을 쓰기 횟수에 나눠 냄)
+        self._created_limit = max(2 * len(self._created), TIMELINE_SIZE)
+
+    def _post_info(self, post_id: str) -> tuple[int, str | None] | None:
+        info = self._created.get(post_id)
+        if info is None:
+            post = self.post_store.get(post_id)
+            if post is None:
+                return None
+            info = self._created[post_id] = (to_epoch(post["created_at"]), _author(post))
+        return info
+
+    def _fan_out(self, post_id: str, created_at: int, author: str | None):
+        for email, timeline in self.timelines.items():
+            if email == author:
+                continue  # 내 글은 내 피드에 넣지 않는다
+            if timeline.upsert(post_id, self.score(post_id, created_at, author, timeline)):
+                self.fanout_writes += 1
+
+    def on_post(self, post: dict):
+        """새 글: 작성자를 뺀 active 사용자 타임라인 전체에 끼워 넣는다."""
+        self._expire_inactive(time.time())
+        info = self._created[post["post_id"]] = (to_epoch(post["created_at"]), _author(post))
+        self._fan_out(post["post_id"], *info)
+
+    def on_like(self, post_id: str, email: str | None = None):
+        """새 좋아요(중복 제외): 누른 사람의 피드를 조정하고,
+        최근 좋아요 수가 LIKE_THRESHOLD 의 배수가 될 때만 다시 fan-out 한다."""
+        now = time.time()
+        self._likes.setdefault(post_id, deque()).append(now)
+        info = self._post_info(post_id)
+        timeline = self.timelines.get(email) if email else None
+        if timeline is not None:
+            timeline.hide(post_id)
+            if info is not None and info[1] is not None:
+                timeline.like_author(info[1])
+        velocity = self._velocity(post_id, now)
+        if velocity % LIKE_THRESHOLD or info is None:
+            return
+        self._boosted[post_id] = velocity
+        self._fan_out(post_id, *info)
+
+    def on_delete(self, post_id: str):
+        self._created.pop(post_id, None)
+        self._likes.pop(post_id, None)
+        self._boosted.pop(post_id, None)
+        for timeline in self.timelines.values():
+            timeline.remove(post_id)
+
+    def _build_timeline(self, email: str) -> Timeline:
+        """비활성 사용자: 전체 최신순 인덱스 앞부분을 훑어서 타임라인을 새로 만든다."""
+        timeline = Timeline()
+        # 어떤 글이든 좋아요로 받을 수 있는 최대 가산점 (새 타임라인은 친밀도가 없다)
+        max_boost = max(self._boosted.values(), default=0) * LIKE_BOOST_SECONDS
+        for post in self.post_store.iter_latest():
+            author = _author(post)
+            if author == email:
+                continue
+            created_at, _ = self._created.setdefault(post["post_id"], (to_epoch(post["created_at"]), author))
+            if len(timeline) >= TIMELINE_SIZE and created_at + max_boost < -timeline.entries[-1][0]:
+                break  # 이보다 오래된 글은 타임라인 꼴찌를 넘을 수 없다
+            timeline.upsert(post["post_id"], self.score(post["post_id"], created_at))
+        if self.liked is not None and timeline.scores:
+            for post_id in self.liked(list(timeline.scores), email):
+                timeline.hide(post_id)
+        return timeline
+
+    def read(self, email: str, page: int, limit: int) -> tuple[list[str], int]:
+        """(post_id 목록, 타임라인 전체 길이)"""
+        now = time.time()
+        self._decay(now)
+        timeline = self.timelines.get(email)
+        if timeline is None:
+            timeline = self._build_timeline(email)
+            self.timelines[email] = timeline
+        timeline.last_seen = now
+        return timeline.page(page, limit), len(timeline)
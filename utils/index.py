@@ -0,0 +1,93 @@
+# utils/index.py
+# posts / comments / likes 로부터 만들어지는 파생 인덱스
+# 원본 데이터는 data/*.json 이고, 인덱스는 언제든 다시 만들 수 있는 값이다.
+
+import os
+
+from utils.data import DATA_DIR, load_data
+from utils.records import intern_user, utc_timestamp
+
+INDEX_FILE = "indexes.json"
+
+# load_indexes() / load_nicknames() 캐시: 파일이 바뀌었을 때(mtime)만 다시 읽는다
+# filename -> (파일 버전, 만든 값)
+_cached = {}
+
+
+def new_indexes() -> dict:
+    """비어 있는 인덱스 구조를 만듭니다."""
+    return {
+        "posts_latest": [],        # 최신순 post_id 목록
+        "posts_by_author": {},     # author_email -> [post_id]
+        "comments_by_post": {},    # post_id -> [comment_id]
+        "comments_by_author": {},  # author_email -> [comment_id]
+        "likes_by_post": {},       # post_id -> [author_email]
+        "likes_by_user": {},       # author_email -> [post_id]
+    }
+
+
+def index_post(indexes: dict, post: dict):
+    """게시글 한 건을 인덱스에 반영합니다."""
+    indexes["posts_latest"].append((utc_timestamp(post["created_at"]), post["post_id"]))
+    indexes["posts_by_author"].setdefault(post["author_email"], []).append(post["post_id"])
+
+
+def index_comment(indexes: dict, comment: dict):
+    """댓글 한 건을 인덱스에 반영합니다."""
+    indexes["comments_by_post"].setdefault(comment["post_id"], []).append(comment["comment_id"])
+    indexes["comments_by_author"].setdefault(comment["author_email"], []).append(comment["comment_id"])
+
+
+def index_like(indexes: dict, like: dict):
+    """좋아요 한 건을 인덱스에 반영합니다."""
+    indexes["likes_by_post"].setdefault(like["post_id"], []).append(like["author_email"])
+    indexes["likes_by_user"].setdefault(like["author_email"], []).append(like["post_id"])
+
+
+def finalize_indexes(indexes: dict) -> dict:
+    """(created_at epoch, post_id) 쌍을 한 번만 정렬해서 최신순 post_id 목록으로 바꿉니다."""
+    latest = indexes["posts_latest"]
+    if latest and isinstance(latest[0], (tuple, list)):
+        latest.sort(reverse=True)
+        indexes["posts_latest"] = [post_id for _, post_id in latest]
+    return indexes
+
+
+def _load_cached(filename: str, build):
+    path = os.path.join(DATA_DIR, filename)
+    # save_data 는 새 파일로 바꿔치기하므로 inode 까지 보면 같은 시각에 두 번 써도 구분된다
+    if os.path.exists(path):
+        st = os.stat(path)
+        version = (st.st_mtime_ns, st.st_ino, st.st_size)
+    else:
+        version = None
+    entry = _cached.get(filename)
+    if entry is None or entry[0] != version:
+        entry = (version, build(load_data(filename)))
+        _cached[filename] = entry
+    return entry[1]
+
+
+def load_indexes() -> dict:
+    """data/indexes.json 을 읽어옵니다. 파일이 그대로면 메모리에 있는 값을 돌려줍니다."""
+    return _load_cached(INDEX_FILE, lambda loaded: loaded if isinstance(loaded, dict) else new_indexes())
+
+
+def load_nicknames() -> dict:
+    """email -> nickname 맵. users.json 이 바뀌었을 때만 다시 만듭니다."""
+    # intern 해 두면 게시글/댓글 레코드의 author_email 과 같은 문자열 객체를 공유한다
+    return _load_cached("users.json", lambda users: {
+        u["email"]: u["nickname"] for u in map(intern_user, users)
+    })
+
+
+def build_indexes(posts, comments, likes) -> dict:
+    """전체 데이터를 한 번씩만 훑어서 인덱스를 새로 만듭니다."""
+    indexes = new_indexes()
+    for p in posts:
+        index_post(indexes, p)
+    for c in comments:
+        index_comment(indexes, c)
+    for lk in likes:
+        index_like(indexes, lk)
+    return finalize_indexes(indexes)
@@ -0,0 +1,371 @@
+# utils/integrity.py
+# data/ 폴더 정합성 검사 및 파생 인덱스 재구성 도구
+#
+# - 각 파일을 JSON 배열 전체로 읽지 않고 레코드 단위로 스트리밍해서 읽는다.
+#   (메모리에 남는 것은 post_id / email 집합과 다시 만드는 인덱스뿐)
+# - 삭제된 게시글에 달린 댓글/좋아요, 탈퇴한 사용자의 좋아요 같은 고아 데이터와
+#   manifest 건수, ID 로그(_ids.log), indexes.json 의 어긋남(drift)을 보고한다.
+# - --repair: 파생 데이터(indexes.json, 파티션 manifest/ID 맵, 공유 인덱스 카운터)를 다시 만든다.
+# - --prune : 고아 댓글/좋아요와 중복 좋아요를 원본 파일에서 지운다. (서버를 멈춘 뒤 사용)
+#
+#   python -m utils.integrity --repair
+#
+# 서버에서는 INTEGRITY_CHECK_INTERVAL(초)을 주면 파일 하나씩 나눠서 백그라운드로 검사한다.
+import argparse
+import asyncio
+import json
+import os
+
+import anyio
+
+from utils.data import DATA_DIR, load_data, save_data
+from utils.index import INDEX_FILE, new_indexes, index_post, index_comment, index_like, finalize_indexes, load_indexes
+from utils.records import to_utc
+from utils.partition import IDS_FILE, MANIFEST_FILE, is_partition_file, load_id_log, write_id_log
+
+CHUNK_SIZE = 64 * 1024
+# 보고서에 예시로 남길 문제 레코드 수
+MAX_SAMPLES = 20
+# 레코드 종류별로 반드시 있어야 하는 문자열 필드 (없으면 malformed_records 로 세고 건너뛴다)
+REQUIRED_FIELDS = {
+    "users": ("email",),
+    "posts": ("post_id", "author_email", "created_at"),
+    "comments": ("comment_id", "post_id", "author_email"),
+    "likes": ("post_id", "author_email"),
+}
+
+
+def is_well_formed(record, kind: str) -> bool:
+    if not (isinstance(record, dict) and all(isinstance(record.get(f), str) for f in REQUIRED_FIELDS[kind])):
+        return False
+    if "created_at" in REQUIRED_FIELDS[kind]:
+        try:
+            to_utc(record["created_at"])
+        except ValueError:
+            return False
+    return True
+
+
+def iter_json_array(path: str, chunk_size: int = CHUNK_SIZE):
+    """JSON 배열 파일에서 원소를 하나씩 꺼냅니다. 파일이 없거나 비어 있으면 아무것도 없음."""
+    if not os.path.exists(path):
+        return
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+        started = False
+        while True:
+            # 공백과 구분자(, [ ])를 건너뛴다
+            while pos < len(buf) and buf[pos] in " \t\r\n,[]":
+                if buf[pos] == "[":
+                    started = True
+                elif buf[pos] == "]" and started:
+                    return
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    return
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield obj
+            pos = end
+
+
+def _rewrite_array(path: str, keep):
+    """keep(record) 가 True 인 것만 남기도록 파일을 스트리밍으로 다시 씁니다."""
+    tmp_path = path + ".tmp"
+    removed = 0
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        out.write("[")
+        first = True
+        for record in iter_json_array(path):
+            if not keep(record):
+                removed += 1
+                continue
+            out.write("\n    " if first else ",\n    ")
+            out.write(json.dumps(record, ensure_ascii=False))
+            first = False
+        out.write("\n]")
+    os.replace(tmp_path, path)
+    return removed
+
+
+class IntegrityChecker:
+    def __init__(self, data_dir: str = DATA_DIR, repair: bool = False, prune: bool = False,
+                 repair_manifest: bool = True):
+        self.data_dir = data_dir
+        self.repair = repair
+        self.prune = prune
+        # 서버 안의 PartitionedStore 는 manifest 와 ID 맵을 메모리에 들고 있다가 다음 쓰기 때 덮어쓰므로
+        # 서버 실행 중(run_background)에는 이 둘을 고치지 않고 보고만 한다.
+        self.repair_manifest = repair_manifest
+
+    def _collection_files(self, name: str) -> list[tuple[str | None, str]]:
+        """(파티션 월 또는 None, 파일 경로) 목록: 예전 단일 파일 + 월별 파티션 파일"""
+        files = [(None, os.path.join(self.data_dir, f"{name}.json"))]
+        part_dir = os.path.join(self.data_dir, name)
+        if os.path.isdir(part_dir):
+            for filename in sorted(os.listdir(part_dir)):
+                if is_partition_file(filename):
+                    files.append((filename[:-5], os.path.join(part_dir, filename)))
+        return files
+
+    def steps(self):
+        """
+        검사를 파일 단위로 나눠 진행하는 generator
+        next() 한 번에 파일 하나를 처리하고, 마지막에 보고서(dict)를 돌려준다.
+        """
+        report = {
+            "counts": {},
+            "orphans": {
+                "posts_without_author": 0,
+                "comments_without_post": 0,
+                "comments_without_author": 0,
+                "likes_without_post": 0,
+                "likes_without_user": 0,
+                "duplicate_likes": 0,
+                "malformed_records": 0,
+            },
+            "drift": {"manifest": {}, "ids": {}, "indexes": {}},
+            "samples": [],
+            "repaired": [],
+            "pruned": {},
+        }
+        orphans = report["orphans"]
+
+        def problem(kind: str, record: dict):
+            orphans[kind] += 1
+            if len(report["samples"]) < MAX_SAMPLES:
+                report["samples"].append({"problem": kind, "record": record})
+
+        emails = set()
+        for u in iter_json_array(os.path.join(self.data_dir, "users.json")):
+            if not is_well_formed(u, "users"):
+                problem("malformed_records", u)
+                continue
+            emails.add(u["email"])
+        report["counts"]["users"] = len(emails)
+        yield
+
+        indexes = new_indexes()
+        post_ids = set()
+        for name in ("posts", "comments"):
+            month_counts = {}
+            month_ids = {}
+            total = 0
+            for month, path in self._collection_files(name):
+                count = 0
+                for record in iter_json_array(path):
+                    count += 1
+                    if not is_well_formed(record, name):
+                        problem("malformed_records", record)
+                        continue
+                    if name == "posts":
+                        post_ids.add(record["post_id"])
+                        index_post(indexes, record)
+                        if month is not None:
+                            month_ids[record["post_id"]] = month
+                        if record["author_email"] not in emails:
+                            problem("posts_without_author", record)
+                    else:
+                        if record["author_email"] not in emails:
+                            problem("comments_without_author", record)
+                        if record["post_id"] not in post_ids:
+                            problem("comments_without_post", record)
+                            if self.prune:
+                                continue  # 지울 댓글은 인덱스에도 넣지 않는다
+                        index_comment(indexes, record)
+                        if month is not None:
+                            month_ids[record["comment_id"]] = month
+                if month is not None:
+                    month_counts[month] = count
+                total += count
+                if self.prune and name == "comments" and count:
+                    # 형식이 깨진 댓글은 고아인지 알 수 없으므로 지우지 않는다
+                    removed = _rewrite_array(
+                        path, lambda c: not is_well_formed(c, "comments") or c["post_id"] in post_ids
+                    )
+                    if removed:
+                        report["pruned"][path] = removed
+                        count -= removed
+                        if month is not None:
+                            month_counts[month] = count
+                        total -= removed
+                yield
+            report["counts"][name] = total
+            self._check_manifest(name, month_counts, month_ids, report)
+
+        seen_likes = set()
+        likes_path = os.path.join(self.data_dir, "likes.json")
+        likes_count = 0
+        for like in iter_json_array(likes_path):
+            likes_count += 1
+            if not is_well_formed(like, "likes"):
+                problem("malformed_records", like)
+                continue
+            key = (like["post_id"], like["author_email"])
+            if key in seen_likes:
+                problem("duplicate_likes", like)
+                continue
+            seen_likes.add(key)
+            orphan = False
+            if like["post_id"] not in post_ids:
+                problem("likes_without_post", like)
+                orphan = True
+            if like["author_email"] not in emails:
+                problem("likes_without_user", like)
+                orphan = True
+            if not (orphan and self.prune):
+                index_like(indexes, like)
+        report["counts"]["likes"] = likes_count
+        if self.prune and likes_count:
+            kept = set()
+
+            def keep_like(like):
+                if not is_well_formed(like, "likes"):
+                    return True
+                key = (like["post_id"], like["author_email"])
+                if key in kept or like["post_id"] not in post_ids or like["author_email"] not in emails:
+                    return False
+                kept.add(key)
+                return True
+
+            removed = _rewrite_array(likes_path, keep_like)
+            if removed:
+                report["pruned"][likes_path] = removed
+        yield
+
+        finalize_indexes(indexes)
+        self._check_indexes(indexes, report)
+        if self.repair and report["drift"]["indexes"]:
+            save_data(indexes, INDEX_FILE, self.data_dir)
+            report["repaired"].append(INDEX_FILE)
+        if self.repair:
+            self._repair_shared_index(report)
+        return report
+
+    def _check_manifest(self, name: str, month_counts: dict, month_ids: dict, report: dict):
+        part_dir = os.path.join(self.data_dir, name)
+        manifest = load_data(MANIFEST_FILE, part_dir)
+        manifest = manifest if isinstance(manifest, dict) else {}
+        drift = {
+            month: {"manifest": manifest.get(month, 0), "actual": month_counts.get(month, 0)}
+            for month in set(manifest) | set(month_counts)
+            if manifest.get(month, 0) != month_counts.get(month, 0)
+        }
+        if drift:
+            report["drift"]["manifest"][name] = drift
+            if self.repair and self.repair_manifest:
+                save_data({m: c for m, c in month_counts.items() if c}, MANIFEST_FILE, part_dir)
+                report["repaired"].append(os.path.join(name, MANIFEST_FILE))
+
+        ids, _ = load_id_log(part_dir)
+        ids = ids or {}
+        bad = sum(1 for k in set(ids) | set(month_ids) if ids.get(k) != month_ids.get(k))
+        if bad:
+            report["drift"]["ids"][name] = bad
+            if self.repair and self.repair_manifest:
+                write_id_log(month_ids, part_dir)
+                report["repaired"].append(os.path.join(name, IDS_FILE))
+
+    def _check_indexes(self, rebuilt: dict, report: dict):
+        if self.data_dir == DATA_DIR:
+            current = load_indexes()
+        else:
+            current = load_data(INDEX_FILE, self.data_dir)
+            current = current if isinstance(current, dict) else new_indexes()
+        drift = {}
+        for key, value in rebuilt.items():
+            stored = current.get(key)
+            if isinstance(value, dict):
+                stored = stored or {}
+                # 키별 항목 수(게시글별 댓글 수, 좋아요 수 등)가 다른 것만 센다
+                bad = sum(1 for k in set(value) | set(stored) if len(value.get(k, [])) != len(stored.get(k, [])))
+            else:
+                bad = 0 if value == stored else abs(len(value) - len(stored or [])) or 1
+            if bad:
+                drift[key] = bad
+        report["drift"]["indexes"] = drift
+
+    def _repair_shared_index(self, report: dict):
+        from utils.shared import shared_index
+        if shared_index is None:
+            return
+        conn = shared_index._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM like_counts")
+        conn.execute("INSERT INTO like_counts (post_id, count) SELECT post_id, COUNT(*) FROM likes GROUP BY post_id")
+        conn.execute("UPDATE meta SET generation = generation + 1 WHERE id = 0")
+        conn.execute("COMMIT")
+        report["repaired"].append("shared_index.like_counts")
+
+    def run(self) -> dict:
+        steps = self.steps()
+        while True:
+            done, report = _advance(steps)
+            if done:
+                return report
+
+
+def _advance(steps) -> tuple[bool, dict | None]:
+    # StopIteration 은 스레드/코루틴 경계를 넘으면 안 되므로 (끝났는지, 보고서)로 바꿔서 돌려준다
+    try:
+        next(steps)
+    except StopIteration as done:
+        return True, done.value
+    return False, None
+
+
+async def run_background(interval: float, data_dir: str = DATA_DIR):
+    """
+    서버 실행 중 주기적으로 검사합니다. 파일 하나 처리할 때마다 스레드에서 실행하고
+    잠깐 양보해서 요청 처리를 막지 않는다. 운영 중에는 인덱스만 다시 만들고 원본과 manifest 는
+    건드리지 않는다. (manifest 어긋남은 서버를 멈추고 --repair 로 고친다)
+    """
+    while True:
+        # 한 번 실패해도(파일이 깨졌거나 쓰는 도중이었거나) 다음 주기에 다시 검사한다
+        try:
+            await _check_once(data_dir)
+        except Exception as e:
+            print(f"정합성 검사 실패: {e!r}")
+        await asyncio.sleep(interval)
+
+
+async def _check_once(data_dir: str):
+    checker = IntegrityChecker(data_dir, repair=True, prune=False, repair_manifest=False)
+    steps = checker.steps()
+    while True:
+        done, report = await anyio.to_thread.run_sync(_advance, steps)
+        if done:
+            break
+        await asyncio.sleep(0.1)
+    if any(report["orphans"].values()) or any(report["drift"].values()):
+        print(f"정합성 검사 결과: {json.dumps({k: report[k] for k in ('orphans', 'drift')}, ensure_ascii=False)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="data/ 폴더 정합성 검사 및 인덱스 재구성")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--repair", action="store_true", help="인덱스/manifest 등 파생 데이터를 다시 만든다")
+    parser.add_argument("--prune", action="store_true", help="고아 댓글/좋아요와 중복 좋아요를 지운다")
+    args = parser.parse_args(argv)
+
+    report = IntegrityChecker(args.data_dir, repair=args.repair, prune=args.prune).run()
+    print(json.dumps(report, ensure_ascii=False, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+# utils/partition.py
+# created_at 월(YYYY-MM) 단위로 나눠 저장하는 게시글/댓글 저장소
+#
+#   data/posts/_manifest.json   {"2026-01": 1200, "2026-02": 800, ...}  (월별 건수)
+#   data/posts/_ids.log         ["post_id", "2026-01"] 한 줄씩             (ID -> 파티션 월, 추가 전용)
+#   data/posts/2026-01.json     그 달에 작성된 게시글 (작성 순서대로)
+#
+# 최근 HOT_PARTITIONS 개 월은 항상 메모리에 두고(hot), 그보다 오래된 월은 필요할 때만
+# 읽어서 메모리 예산(COLD_CACHE_BYTES) 안에서 LRU 로 유지한다(cold).
+# 최신순 페이지는 manifest 의 월별 건수만으로 건너뛸 수 있으므로, 깊은 과거 데이터는
+# 실제로 그 페이지를 요청하기 전까지 읽지 않는다.
+# ID 로 찾을 때는 _ids.log 로 만든 맵으로 파티션을 바로 골라서 그 파티션만 읽는다.
+# 이 맵은 글을 쓸 때마다 파일 전체를 다시 쓰지 않고 한 줄씩 이어 붙인다. (삭제는 ["id", null])
+# 지워진 줄이 쌓여 살아 있는 ID 의 두 배를 넘으면 그때 한 번 다시 쓴다.
+#
+# 메모리에 올라온 파티션은 dict 가 아니라 utils.records 의 압축 레코드(PostRecord 등)로 들고 있고,
+# 밖으로 돌려줄 때(get/page_latest 등)와 파일에 쓸 때만 dict 로 바꾼다.
+import bisect
+import json
+import os
+import sys
+from collections import OrderedDict
+from operator import attrgetter
+
+from utils.data import DATA_DIR, load_data, save_data
+from utils.records import IdMap, PostCodec, CommentCodec, to_utc, utc_timestamp
+
+MANIFEST_FILE = "_manifest.json"
+IDS_FILE = "_ids.log"
+# 로그 줄 수가 (살아 있는 ID 수 * 2 + 이 값)을 넘으면 다시 쓴다
+IDS_COMPACT_SLACK = 1024
+HOT_PARTITIONS = int(os.getenv("HOT_PARTITIONS", "2"))
+COLD_CACHE_BYTES = int(os.getenv("COLD_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+
+def is_partition_file(filename: str) -> bool:
+    """파티션 폴더 안의 파일 중 실제 레코드 파일인지 (_manifest.json 같은 메타 파일 제외)"""
+    return filename.endswith(".json") and not filename.startswith("_")
+
+
+def load_id_log(store_dir: str) -> tuple[dict[str, str], int] | tuple[None, int]:
+    """_ids.log 를 읽어 (ID -> 월 맵, 로그 줄 수)를 돌려줍니다. 파일이 없으면 맵은 None"""
+    path = os.path.join(store_dir, IDS_FILE)
+    if not os.path.exists(path):
+        return None, 0
+    ids: dict[str, str] = {}
+    lines = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record_id, month = json.loads(line)
+            except ValueError:
+                continue  # 쓰다가 끊긴 마지막 줄
+            lines += 1
+            if month is None:
+                ids.pop(record_id, None)
+            else:
+                ids[record_id] = sys.intern(month)
+    return ids, lines
+
+
+def append_id_log(entries, store_dir: str) -> int:
+    """(ID, 월 또는 None) 들을 _ids.log 끝에 이어 붙이고 붙인 줄 수를 돌려줍니다."""
+    os.makedirs(store_dir, exist_ok=True)
+    lines = [json.dumps([record_id, month], ensure_ascii=False) + "\n" for record_id, month in entries]
+    with open(os.path.join(store_dir, IDS_FILE), "a", encoding="utf-8") as f:
+        f.writelines(lines)
+    return len(lines)
+
+
+def write_id_log(ids: dict[str, str], store_dir: str):
+    """살아 있는 ID 만으로 _ids.log 를 새로 씁니다. (임시 파일에 쓴 뒤 바꿔치기)"""
+    os.makedirs(store_dir, exist_ok=True)
+    path = os.path.join(store_dir, IDS_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.writelines(json.dumps([record_id, month], ensure_ascii=False) + "\n" for record_id, month in ids.items())
+    os.replace(path + ".tmp", path)
+
+
+def partition_key(created_at: str) -> str:
+    """ISO 시간 문자열에서 파티션 키(UTC 기준 YYYY-MM)를 뽑습니다."""
+    return to_utc(created_at).strftime("%Y-%m")
+
+
+_created_at = attrgetter("created_at")
+
+
+class Segment:
+    __slots__ = ("month", "records", "size")
+
+    def __init__(self, month: str, records: list, size: int):
+        self.month = month
+        # 압축 레코드를 created_at(UTC epoch) 오름차순으로 유지 (최신순은 뒤에서부터 읽는다)
+        records.sort(key=_created_at)
+        self.records = records
+        self.size = size
+
+    def insert(self, record):
+        bisect.insort_right(self.records, record, key=_created_at)
+
+    def remove(self, i: int):
+        return self.records.pop(i)
+
+
+class PartitionedStore:
+    def __init__(self, name: str, codec, data_dir: str = DATA_DIR,
+                 hot_partitions: int = HOT_PARTITIONS, cold_budget_bytes: int = COLD_CACHE_BYTES):
+        self.dir = os.path.join(data_dir, name)
+        # codec: dict <-> 압축 레코드 변환기 (utils.records.PostCodec / CommentCodec)
+        self.codec = codec
+        self.id_field = codec.id_field
+        self.hot_partitions = hot_partitions
+        self.cold_budget_bytes = cold_budget_bytes
+        manifest = load_data(MANIFEST_FILE, self.dir)
+        self._manifest: dict[str, int] = manifest if isinstance(manifest, dict) else {}
+        self._hot: dict[str, Segment] = {}
+        self._cold: OrderedDict[str, Segment] = OrderedDict()
+        self._cold_bytes = 0
+        ids, self._id_log_lines = load_id_log(self.dir)
+        self._ids: dict[str, str] = ids or {}
+        if ids is None and self._manifest:
+            # _ids.log 가 없던 예전 데이터: 한 번만 전체 파티션을 훑어서 만든다
+            self._ids = {codec.record_id(r): month for month in self._manifest for r in self.segment(month).records}
+            self._compact_ids()
+        elif self._id_log_lines > 2 * len(self._ids) + IDS_COMPACT_SLACK:
+            self._compact_ids()
+
+    def __len__(self):
+        return sum(self._manifest.values())
+
+    def months(self) -> list[str]:
+        """최신 월부터 정렬된 파티션 키 목록"""
+        return sorted(self._manifest, reverse=True)
+
+    def _is_hot(self, month: str) -> bool:
+        return month in self.months()[:self.hot_partitions]
+
+    def _load(self, month: str) -> Segment:
+        path = os.path.join(self.dir, f"{month}.json")
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        return Segment(month, [self.codec.from_dict(d) for d in load_data(f"{month}.json", self.dir)], size)
+
+    def segment(self, month: str) -> Segment:
+        """파티션을 돌려줍니다. cold 파티션은 이때 처음 디스크에서 읽습니다."""
+        seg = self._hot.get(month)
+        if seg is not None:
+            return seg
+        seg = self._cold.get(month)
+        if seg is not None:
+            self._cold.move_to_end(month)
+            return seg
+        seg = self._load(month)
+        if self._is_hot(month):
+            self._hot[month] = seg
+        else:
+            self._cold[month] = seg
+            self._cold_bytes += seg.size
+            self._evict()
+        return seg
+
+    def _evict(self):
+        # 가장 최근에 쓴 파티션 하나는 예산을 넘어도 남겨 둔다 (방금 읽은 것)
+        while self._cold_bytes > self.cold_budget_bytes and len(self._cold) > 1:
+            _, seg = self._cold.popitem(last=False)
+            self._cold_bytes -= seg.size
+
+    def _rebalance(self):
+        # 새 월이 생기면 가장 오래된 hot 파티션은 cold 로 내려간다
+        hot = set(self.months()[:self.hot_partitions])
+        for month in [m for m in self._hot if m not in hot]:
+            seg = self._hot.pop(month)
+            self._cold[month] = seg
+            self._cold_bytes += seg.size
+        for month in [m for m in self._cold if m in hot]:
+            seg = self._cold.pop(month)
+            self._cold_bytes -= seg.size
+            self._hot[month] = seg
+        self._evict()
+
+    def _compact_ids(self):
+        write_id_log(self._ids, self.dir)
+        self._id_log_lines = len(self._ids)
+
+    def _log_id(self, record_id: str, month: str | None):
+        """ID 맵 변경을 로그에 한 줄 붙입니다. 지워진 줄이 너무 많아지면 다시 쓴다."""
+        self._id_log_lines += append_id_log([(record_id, month)], self.dir)
+        if self._id_log_lines > 2 * len(self._ids) + IDS_COMPACT_SLACK:
+            self._compact_ids()
+
+    def _save(self, seg: Segment):
+        path = os.path.join(self.dir, f"{seg.month}.json")
+        save_data([self.codec.to_dict(r) for r in seg.records], f"{seg.month}.json", self.dir)
+        save_data(self._manifest, MANIFEST_FILE, self.dir)
+        size = os.path.getsize(path)
+        if seg.month in self._cold:
+            self._cold_bytes += size - seg.size
+        seg.size = size
+
+    def add(self, record: dict):
+        month = partition_key(record["created_at"])
+        if month not in self._manifest:
+            # 처음 보는 월: 빈 파티션을 만들고 hot/cold 를 다시 나눈다
+            self._manifest[month] = 0
+            self._cold[month] = Segment(month, [], 0)
+            self._rebalance()
+        self._manifest[month] += 1
+        self._ids[record[self.id_field]] = month
+        seg = self.segment(month)
+        seg.insert(self.codec.from_dict(record))
+        self._save(seg)
+        self._log_id(record[self.id_field], month)
+
+    def find(self, record_id: str) -> tuple[Segment, int] | tuple[None, None]:
+        """ID 가 들어 있는 파티션 하나만 읽어서 찾습니다. 없는 ID 는 파티션을 읽지 않는다."""
+        month = self._ids.get(record_id)
+        if month is None:
+            return None, None
+        seg = self.segment(month)
+        record_id_of = self.codec.record_id
+        for i in range(len(seg.records) - 1, -1, -1):
+            if record_id_of(seg.records[i]) == record_id:
+                return seg, i
+        return None, None
+
+    def get(self, record_id: str) -> dict | None:
+        seg, i = self.find(record_id)
+        return None if seg is None else self.codec.to_dict(seg.records[i])
+
+    def get_many(self, record_ids) -> dict[str, dict]:
+        """여러 ID 를 파티션별로 묶어서, 필요한 파티션만 한 번씩 훑어 찾습니다."""
+        by_month: dict[str, set] = {}
+        for record_id in record_ids:
+            month = self._ids.get(record_id)
+            if month is not None:
+                by_month.setdefault(month, set()).add(record_id)
+        found = {}
+        record_id_of = self.codec.record_id
+        for month, wanted in by_month.items():
+            for record in self.segment(month).records:
+                record_id = record_id_of(record)
+                if record_id in wanted:
+                    found[record_id] = self.codec.to_dict(record)
+        return found
+
+    def update(self, record_id: str, changes: dict) -> dict | None:
+        """title/content 같은 필드를 바꿉니다. (created_at 은 바꾸지 않는 것을 전제로 한다)"""
+        seg, i = self.find(record_id)
+        if seg is None:
+            return None
+        updated = self.codec.to_dict(seg.records[i])
+        updated.update(changes)
+        seg.records[i] = self.codec.from_dict(updated)
+        self._save(seg)
+        return updated
+
+    def delete(self, record_id: str) -> dict | None:
+        seg, i = self.find(record_id)
+        if seg is None:
+            return None
+        record = seg.remove(i)
+        self._manifest[seg.month] -= 1
+        del self._ids[record_id]
+        self._save(seg)
+        self._log_id(record_id, None)
+        return self.codec.to_dict(record)
+
+    def iter_latest(self):
+        """최신순으로 하나씩(dict) 돌려줍니다. 필요한 파티션만 차례로 읽습니다."""
+        to_dict = self.codec.to_dict
+        for month in self.months():
+            for record in reversed(self.segment(month).records):
+                yield to_dict(record)
+
+    def page_latest(self, page: int, limit: int) -> list[dict]:
+        """최신순 페이지. 앞쪽 파티션은 manifest 건수로 건너뛰고 읽지 않는다."""
+        skip = (page - 1) * limit
+        result = []
+        for month in self.months():
+            count = self._manifest[month]
+            if skip >= count:
+                skip -= count
+                continue
+            records = self.segment(month).records
+            end = len(records) - skip
+            result.extend(self.codec.to_dict(r) for r in reversed(records[max(0, end - (limit - len(result))):end]))
+            skip = 0
+            if len(result) >= limit:
+                break
+        return result
+
+    def search(self, keyword: str, page: int, limit: int, fields=("title", "content")) -> list[dict]:
+        """최신순으로 훑으며 keyword 가 포함된 항목을 찾고, 페이지가 채워지면 멈춥니다."""
+        skip = (page - 1) * limit
+        result = []
+        for month in self.months():
+            for record in reversed(self.segment(month).records):
+                # dict 로 바꾸지 않고 압축 레코드의 필드를 바로 본다
+                if any(keyword in (getattr(record, f, None) or "") for f in fields):
+                    if skip:
+                        skip -= 1
+                        continue
+                    result.append(self.codec.to_dict(record))
+                    if len(result) >= limit:
+                        return result
+        return result
+
+
+def write_partitions(records, store_dir: str, id_field: str):
+    """레코드들을 월별 파티션 파일과 manifest, ID 로그(_ids.log)로 기록합니다. (기존 파티션에 이어 붙임)"""
+    manifest = load_data(MANIFEST_FILE, store_dir)
+    manifest = manifest if isinstance(manifest, dict) else {}
+    by_month: dict[str, list] = {}
+    for record in records:
+        by_month.setdefault(partition_key(record["created_at"]), []).append(record)
+    for month, month_records in by_month.items():
+        month_records = load_data(f"{month}.json", store_dir) + month_records
+        month_records.sort(key=lambda r: utc_timestamp(r["created_at"]))
+        save_data(month_records, f"{month}.json", store_dir)
+        manifest[month] = len(month_records)
+    save_data(manifest, MANIFEST_FILE, store_dir)
+    append_id_log(((r[id_field], month) for month, month_records in by_month.items() for r in month_records),
+                  store_dir)
+
+
+def migrate_legacy_file(filename: str, store: PartitionedStore):
+    """예전 단일 파일(posts.json 등)을 월별 파티션으로 나눕니다."""
+    write_partitions(load_data(filename), store.dir, store.id_field)
+    # 메모리에 올라와 있던 파티션은 버리고 manifest 부터 다시 읽는다
+    store.__init__(os.path.basename(store.dir), store.codec, os.path.dirname(store.dir),
+                   store.hot_partitions, store.cold_budget_bytes)
+
+
+# 게시글과 댓글은 같은 IdMap 을 써서 post_id 가 같은 정수 ID 로 바뀐다
+post_ids = IdMap()
+post_store = PartitionedStore("posts", PostCodec(post_ids))
+comment_store = PartitionedStore("comments", CommentCodec(post_ids))
@@ -0,0 +1,82 @@
+# utils/pubsub.py
+# 게시글 단위 실시간 이벤트(댓글/좋아요) 허브
+# 클라이언트가 댓글/좋아요 목록을 폴링하는 대신 SSE 로 변경 사항을 받는다.
+# 구독자마다 크기가 정해진 큐를 두고, 느린 구독자는 오래된 이벤트를 버린 뒤
+# "resync" 이벤트 하나로 합쳐서 알려준다 (클라이언트는 목록을 한 번 다시 조회).
+#
+# 허브는 프로세스(워커) 안의 메모리에만 있다. uvicorn --workers N 으로 띄우면
+# 다른 워커가 처리한 댓글/좋아요 이벤트는 이 워커의 구독자에게 전달되지 않는다.
+# 여러 워커에서 쓰려면 워커 간 브로커(Redis pub/sub 등)로 publish 를 옮겨야 한다.
+import asyncio
+import json
+
+# 구독자 한 명당 쌓아 둘 최대 이벤트 수
+QUEUE_SIZE = 64
+# 연결 유지를 위한 heartbeat 간격(초)
+HEARTBEAT_SECONDS = 15
+
+
+class Subscriber:
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self, queue_size: int):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+
+class PostEventHub:
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[Subscriber]] = {}
+
+    def subscriber_count(self, post_id: str | None = None) -> int:
+        if post_id is not None:
+            return len(self._subscribers.get(post_id, ()))
+        return sum(len(s) for s in self._subscribers.values())
+
+    def subscribe(self, post_id: str) -> Subscriber:
+        sub = Subscriber(self.queue_size)
+        self._subscribers.setdefault(post_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, post_id: str, sub: Subscriber):
+        subs = self._subscribers.get(post_id)
+        if subs is None:
+            return
+        subs.discard(sub)
+        if not subs:
+            del self._subscribers[post_id]
+
+    def publish(self, post_id: str, event: str, data: dict):
+        """게시글의 모든 구독자에게 이벤트를 보냅니다. 절대 기다리지(block) 않습니다."""
+        subs = self._subscribers.get(post_id)
+        if not subs:
+            return
+        message = (event, json.dumps(data, ensure_ascii=False, default=str))
+        for sub in subs:
+            if sub.queue.full():
+                # 느린 구독자: 가장 오래된 이벤트를 버리고 몇 개를 버렸는지만 기록
+                sub.queue.get_nowait()
+                sub.dropped += 1
+            sub.queue.put_nowait(message)
+
+    async def stream(self, post_id: str, heartbeat: float = HEARTBEAT_SECONDS):
+        """SSE 형식의 문자열을 만들어 내는 async generator"""
+        sub = self.subscribe(post_id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if sub.dropped:
+                    yield f"event: resync\ndata: {json.dumps({'dropped': sub.dropped})}\n\n"
+                    sub.dropped = 0
+                yield f"event: {event}\ndata: {data}\n\n"
+        finally:
+            self.unsubscribe(post_id, sub)
+
+
+hub = PostEventHub()
@@ -0,0 +1,165 @@
+# utils/records.py
+# 메모리에 올려 둘 게시글/댓글의 압축 표현
+# dict 한 건마다 붙는 키 문자열, ISO 시간 문자열, 반복되는 이메일 문자열 대신
+# __slots__ 클래스 + intern 된 문자열 + epoch 정수 + 내부 정수 ID 를 사용한다.
+# 파티션(utils.partition)은 이 형태로 들고 있고, API 로 나갈 때만 dict 로 바꾼다.
+#
+# created_at 은 "Z", "+09:00" 처럼 시간대 표기가 섞여 들어오므로 문자열 그대로 자르거나
+# 정렬하지 않고, 항상 UTC 로 맞춘 값으로 비교한다.
+import sys
+from datetime import datetime, timezone
+
+
+def to_utc(value: str) -> datetime:
+    """ISO 8601 문자열을 UTC datetime 으로 바꿉니다. 시간대가 없으면 UTC 로 본다."""
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def utc_timestamp(value: str) -> float:
+    """정렬용 키: ISO 8601 문자열의 epoch 초(소수점 포함)"""
+    return to_utc(value).timestamp()
+
+
+def to_epoch(value: str) -> int:
+    """ISO 8601 문자열을 epoch 초(int)로 바꿉니다."""
+    return int(utc_timestamp(value))
+
+
+def from_epoch(value: int) -> str:
+    """epoch 초를 API 응답용 ISO 8601 문자열로 되돌립니다."""
+    return datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+
+class IdMap:
+    """외부 문자열 ID(post_id 등) <-> 내부 정수 ID 매핑"""
+    __slots__ = ("_to_int", "_to_str")
+
+    def __init__(self):
+        self._to_int = {}
+        self._to_str = []
+
+    def __len__(self):
+        return len(self._to_str)
+
+    def get_or_add(self, key: str) -> int:
+        iid = self._to_int.get(key)
+        if iid is None:
+            iid = len(self._to_str)
+            self._to_int[key] = iid
+            self._to_str.append(key)
+        return iid
+
+    def get(self, key: str) -> int | None:
+        return self._to_int.get(key)
+
+    def key(self, iid: int) -> str:
+        return self._to_str[iid]
+
+
+class PostRecord:
+    __slots__ = ("pid", "title", "content", "author_email", "created_at")
+
+    def __init__(self, pid: int, title: str, content: str, author_email: str, created_at: int):
+        self.pid = pid
+        self.title = title
+        self.content = content
+        self.author_email = author_email
+        self.created_at = created_at
+
+
+class CommentRecord:
+    __slots__ = ("comment_id", "pid", "author_email", "content", "created_at", "updated_at")
+
+    def __init__(self, comment_id: str, pid: int, author_email: str, content: str,
+                 created_at: int, updated_at: int):
+        self.comment_id = comment_id
+        self.pid = pid
+        self.author_email = author_email
+        self.content = content
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+
+def post_from_dict(p: dict, ids: IdMap) -> PostRecord:
+    return PostRecord(
+        ids.get_or_add(p["post_id"]),
+        p["title"],
+        p["content"],
+        sys.intern(p["author_email"]),
+        to_epoch(p["created_at"]),
+    )
+
+
+def post_to_dict(r: PostRecord, ids: IdMap) -> dict:
+    return {
+        "post_id": ids.key(r.pid),
+        "title": r.title,
+        "content": r.content,
+        "author_email": r.author_email,
+        "created_at": from_epoch(r.created_at),
+    }
+
+
+def comment_from_dict(c: dict, ids: IdMap) -> CommentRecord:
+    created_at = to_epoch(c["created_at"])
+    return CommentRecord(
+        c["comment_id"],
+        ids.get_or_add(c["post_id"]),
+        sys.intern(c["author_email"]),
+        c["content"],
+        created_at,
+        to_epoch(c["updated_at"]) if c.get("updated_at") else created_at,
+    )
+
+
+def comment_to_dict(r: CommentRecord, ids: IdMap) -> dict:
+    return {
+        "comment_id": r.comment_id,
+        "post_id": ids.key(r.pid),
+        "author_email": r.author_email,
+        "content": r.content,
+        "created_at": from_epoch(r.created_at),
+        "updated_at": from_epoch(r.updated_at),
+    }
+
+
+class PostCodec:
+    """PartitionedStore 가 게시글을 dict <-> PostRecord 로 바꿀 때 쓰는 변환기"""
+    id_field = "post_id"
+
+    def __init__(self, ids: IdMap):
+        self.ids = ids
+
+    def from_dict(self, p: dict) -> PostRecord:
+        return post_from_dict(p, self.ids)
+
+    def to_dict(self, r: PostRecord) -> dict:
+        return post_to_dict(r, self.ids)
+
+    def record_id(self, r: PostRecord) -> str:
+        return self.ids.key(r.pid)
+
+
+class CommentCodec:
+    """댓글용 변환기. post_id 는 게시글과 같은 IdMap 을 써서 같은 정수 ID 가 된다."""
+    id_field = "comment_id"
+
+    def __init__(self, ids: IdMap):
+        self.ids = ids
+
+    def from_dict(self, c: dict) -> CommentRecord:
+        return comment_from_dict(c, self.ids)
+
+    def to_dict(self, r: CommentRecord) -> dict:
+        return comment_to_dict(r, self.ids)
+
+    def record_id(self, r: CommentRecord) -> str:
+        return r.comment_id
+
+
+def intern_user(u: dict) -> dict:
+    """사용자 dict 의 이메일/닉네임을 intern 해서 게시글/댓글과 같은 객체를 공유하게 합니다."""
+    u["email"] = sys.intern(u["email"])
+    u["nickname"] = sys.intern(u["nickname"])
+    return u
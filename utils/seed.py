@@ -0,0 +1,168 @@
+# utils/seed.py
+# 대량 데이터 적재(시드) CLI
+# POST /users 를 한 명씩 호출하면 매번 users.json 전체를 다시 쓰게 되므로(O(N²)),
+# NDJSON/CSV 파일을 스트리밍으로 읽어서 data/ 폴더와 인덱스를 한 번에 기록한다.
+# 게시글/댓글은 utils.partition 과 같은 월별 파티션 형식으로 기록한다.
+#
+# 이미 데이터가 있는 컬렉션에는 적재하지 않는다 (중복/덮어쓰기 방지).
+# 컬렉션별로 나눠서 여러 번 실행할 수 있고, indexes.json 은 매번 적재가 끝난 data/ 전체에서 다시 만든다.
+#
+# 사용 예)
+#   python -m utils.seed --users users.ndjson --posts posts.csv \
+#       --comments comments.ndjson --likes likes.csv --workers 8 --rounds 4
+import argparse
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+
+from utils.auth import hash_password, bcrypt_rounds
+from utils.data import DATA_DIR, save_data
+from utils.integrity import IntegrityChecker, iter_json_array
+from utils.partition import is_partition_file, write_partitions
+
+# 한 번에 프로세스 풀로 넘기는 사용자 수 (메모리 사용량을 일정하게 유지)
+HASH_BATCH_SIZE = 10_000
+
+
+def iter_records(path: str):
+    """확장자에 따라 CSV 또는 NDJSON 파일을 한 줄씩 읽어 dict 로 돌려줍니다."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _batched(iterable, size: int):
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _hash_one(args: tuple) -> str:
+    password, rounds = args
+    return hash_password(password, rounds)
+
+
+def seed_users(path: str, workers: int, rounds: int) -> list:
+    """비밀번호 해싱을 프로세스 풀에 나눠서 처리하며 사용자 목록을 만듭니다."""
+    users = []
+    seen = set()
+    now = datetime.now(timezone.utc).isoformat()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in _batched(iter_records(path), HASH_BATCH_SIZE):
+            # 파일 안에서 중복된 이메일은 처음 나온 것만 사용
+            batch = [u for u in batch if u["email"] not in seen and not seen.add(u["email"])]
+            hashed = pool.map(_hash_one, [(u["password"], rounds) for u in batch], chunksize=64)
+            for u, hashed_password in zip(batch, hashed):
+                users.append({
+                    "email": u["email"],
+                    "password": hashed_password,
+                    "nickname": u["nickname"],
+                    "profile_image": u.get("profile_image") or None,
+                    "created_at": u.get("created_at") or now,
+                })
+    return users
+
+
+def seed_posts(path: str) -> list:
+    posts = []
+    now = datetime.now(timezone.utc).isoformat()
+    for i, p in enumerate(iter_records(path), start=1):
+        post = {
+            "post_id": str(p.get("post_id") or i),
+            "title": p["title"],
+            "content": p["content"],
+            "author_email": p["author_email"],
+            "created_at": p.get("created_at") or now,
+        }
+        posts.append(post)
+    return posts
+
+
+def seed_comments(path: str) -> list:
+    comments = []
+    now = datetime.now(timezone.utc).isoformat()
+    for i, c in enumerate(iter_records(path), start=1):
+        created_at = c.get("created_at") or now
+        comment = {
+            "comment_id": str(c.get("comment_id") or f"comment_{i}"),
+            "post_id": str(c["post_id"]),
+            "author_email": c["author_email"],
+            "content": c["content"],
+            "created_at": created_at,
+            "updated_at": c.get("updated_at") or created_at,
+        }
+        comments.append(comment)
+    return comments
+
+
+def seed_likes(path: str) -> list:
+    likes = []
+    seen = set()
+    now = datetime.now(timezone.utc).isoformat()
+    for lk in iter_records(path):
+        key = (str(lk["post_id"]), lk["author_email"])
+        # 같은 게시글에 같은 사용자의 좋아요는 한 번만
+        if key in seen:
+            continue
+        seen.add(key)
+        like = {"post_id": key[0], "author_email": key[1], "created_at": lk.get("created_at") or now}
+        likes.append(like)
+    return likes
+
+
+def has_records(data_dir: str, name: str) -> bool:
+    """data_dir 에 name 컬렉션(단일 파일 또는 월별 파티션)의 레코드가 하나라도 있는지"""
+    paths = [os.path.join(data_dir, f"{name}.json")]
+    part_dir = os.path.join(data_dir, name)
+    if os.path.isdir(part_dir):
+        paths += [os.path.join(part_dir, f) for f in os.listdir(part_dir) if is_partition_file(f)]
+    return any(next(iter_json_array(path), None) is not None for path in paths)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NDJSON/CSV 파일로 data/ 폴더를 한 번에 채웁니다.")
+    parser.add_argument("--users", help="사용자 파일 (email, password, nickname, profile_image)")
+    parser.add_argument("--posts", help="게시글 파일 (post_id, title, content, author_email, created_at)")
+    parser.add_argument("--comments", help="댓글 파일 (comment_id, post_id, author_email, content, created_at)")
+    parser.add_argument("--likes", help="좋아요 파일 (post_id, author_email, created_at)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="결과를 기록할 폴더")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="비밀번호 해싱 프로세스 수")
+    parser.add_argument("--rounds", type=int, default=bcrypt_rounds, help="bcrypt cost (부하 테스트용으로 낮출 수 있음)")
+    args = parser.parse_args(argv)
+
+    for name in ("users", "posts", "comments", "likes"):
+        if getattr(args, name) and has_records(args.data_dir, name):
+            parser.error(f"{args.data_dir} 에 이미 {name} 데이터가 있습니다. 빈 폴더(또는 빈 컬렉션)에만 적재합니다.")
+
+    if args.users:
+        users = seed_users(args.users, args.workers, args.rounds)
+        save_data(users, "users.json", args.data_dir)
+        print(f"users: {len(users)}")
+    if args.posts:
+        posts = seed_posts(args.posts)
+        write_partitions(posts, os.path.join(args.data_dir, "posts"), "post_id")
+        print(f"posts: {len(posts)}")
+    if args.comments:
+        comments = seed_comments(args.comments)
+        write_partitions(comments, os.path.join(args.data_dir, "comments"), "comment_id")
+        print(f"comments: {len(comments)}")
+    if args.likes:
+        likes = seed_likes(args.likes)
+        save_data(likes, "likes.json", args.data_dir)
+        print(f"likes: {len(likes)}")
+
+    # 이번에 넣은 파일만이 아니라 적재가 끝난 전체 데이터로 인덱스를 다시 만든다
+    report = IntegrityChecker(args.data_dir, repair=True).run()
+    print(f"indexes: {'rebuilt' if report['drift']['indexes'] else 'up to date'}")
+
+
+if __name__ == "__main__":
+    main()
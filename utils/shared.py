@@ -0,0 +1,203 @@
+# utils/shared.py
+# uvicorn --workers N 환경에서 모든 워커가 함께 쓰는 인덱스 (로컬 디스크의 SQLite)
+# 워커마다 인덱스/카운터를 따로 들고 있으면 메모리가 N배가 되고 쓰기 직후 값이 서로 다르다.
+# 쓰기는 SQLite 에 하고 같은 트랜잭션에서 generation 을 1 올린다.
+# 읽기는 generation 만 먼저 확인해서 바뀌지 않았으면 워커 로컬 캐시를 그대로 쓴다.
+#
+# 토큰 denylist(utils.denylist)도 이 모드에서는 여기에 기록한다.
+#
+# SHARED_INDEX=1 환경 변수로 켭니다.
+import os
+import sqlite3
+import threading
+import time
+
+from utils.data import DATA_DIR
+
+SHARED_INDEX = os.getenv("SHARED_INDEX", "0") == "1"
+SHARED_INDEX_PATH = os.getenv("SHARED_INDEX_PATH", os.path.join(DATA_DIR, "shared_index.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    generation INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (id, generation) VALUES (0, 0);
+CREATE TABLE IF NOT EXISTS likes (
+    post_id TEXT NOT NULL,
+    author_email TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (post_id, author_email)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS like_counts (
+    post_id TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS revoked_tokens_expires_at ON revoked_tokens (expires_at);
+CREATE TABLE IF NOT EXISTS revoked_subjects (
+    sub TEXT PRIMARY KEY,
+    revoked_at INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SharedIndex:
+    def __init__(self, path: str = SHARED_INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+        # 워커 로컬 캐시: generation 이 바뀌면 통째로 비운다
+        self._generation = -1
+        self._cache = {}
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def generation(self) -> int:
+        """현재 generation (PK 한 건 조회라 매 요청마다 불러도 된다)"""
+        return self._conn().execute("SELECT generation FROM meta WHERE id = 0").fetchone()[0]
+
+    def _check_generation(self):
+        gen = self.generation()
+        if gen != self._generation:
+            self._cache.clear()
+            self._generation = gen
+
+    def add_like(self, post_id: str, author_email: str, created_at: str) -> bool:
+        """좋아요 등록. 이미 눌렀으면 False"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            added = conn.execute(
+                "INSERT OR IGNORE INTO likes (post_id, author_email, created_at) VALUES (?, ?, ?)",
+                (post_id, author_email, created_at),
+            ).rowcount > 0
+            if added:
+                conn.execute(
+                    "INSERT INTO like_counts (post_id, count) VALUES (?, 1) "
+                    "ON CONFLICT(post_id) DO UPDATE SET count = count + 1",
+                    (post_id,),
+                )
+                conn.execute("UPDATE meta SET generation = generation + 1 WHERE id = 0")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def remove_like(self, post_id: str, author_email: str) -> bool:
+        """좋아요 취소. 누른 적이 없으면 False"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = conn.execute(
+                "DELETE FROM likes WHERE post_id = ? AND author_email = ?",
+                (post_id, author_email),
+            ).rowcount > 0
+            if removed:
+                conn.execute("UPDATE like_counts SET count = count - 1 WHERE post_id = ?", (post_id,))
+                conn.execute("UPDATE meta SET generation = generation + 1 WHERE id = 0")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    def like_status(self, post_id: str, author_email: str) -> tuple[int, bool]:
+        """(좋아요 수, 내가 눌렀는지) — generation 이 같으면 로컬 캐시에서 돌려준다."""
+        self._check_generation()
+        key = (post_id, author_email)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        conn = self._conn()
+        row = conn.execute("SELECT count FROM like_counts WHERE post_id = ?", (post_id,)).fetchone()
+        liked = conn.execute(
+            "SELECT 1 FROM likes WHERE post_id = ? AND author_email = ?", (post_id, author_email)
+        ).fetchone() is not None
+        result = (row[0] if row else 0, liked)
+        self._cache[key] = result
+        return result
+
+    def like_status_many(self, post_ids: list[str], author_email: str) -> dict[str, tuple[int, bool]]:
+        """
+        여러 게시글의 (좋아요 수, 내가 눌렀는지)를 돌려줍니다.
+        로컬 캐시에 없는 것만 모아서 쿼리 두 번으로 조회하고 캐시에 넣는다.
+        """
+        self._check_generation()
+        result = {}
+        missing = []
+        for pid in post_ids:
+            cached = self._cache.get((pid, author_email))
+            if cached is None:
+                missing.append(pid)
+            else:
+                result[pid] = cached
+        if missing:
+            conn = self._conn()
+            marks = ",".join("?" * len(missing))
+            counts = dict(conn.execute(
+                f"SELECT post_id, count FROM like_counts WHERE post_id IN ({marks})", missing
+            ))
+            liked = {row[0] for row in conn.execute(
+                f"SELECT post_id FROM likes WHERE author_email = ? AND post_id IN ({marks})",
+                [author_email, *missing],
+            )}
+            for pid in missing:
+                result[pid] = self._cache[(pid, author_email)] = (counts.get(pid, 0), pid in liked)
+        return {pid: result[pid] for pid in post_ids}
+
+    def revoke_jti(self, jti: str, expires_at: float):
+        """토큰 하나를 만료 시각까지 무효화합니다. 기록하면서 만료된 항목을 지운다."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (time.time(),))
+            conn.execute("INSERT OR REPLACE INTO revoked_tokens (jti, expires_at) VALUES (?, ?)", (jti, expires_at))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def revoke_subject(self, sub: str, revoked_at: int, expires_at: float):
+        """revoked_at(초) 이전에 sub 에게 발급된 토큰을 expires_at 까지 무효화합니다."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM revoked_subjects WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "INSERT OR REPLACE INTO revoked_subjects (sub, revoked_at, expires_at) VALUES (?, ?, ?)",
+                (sub, revoked_at, expires_at),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def revocation(self, jti: str | None, sub: str | None) -> tuple[bool, int | None]:
+        """(jti 가 무효화됐는지, sub 의 무효화 시각 또는 None) — 만료된 항목은 없는 것으로 본다."""
+        conn = self._conn()
+        now = time.time()
+        jti_revoked = conn.execute(
+            "SELECT 1 FROM revoked_tokens WHERE jti = ? AND expires_at > ?", (jti, now)
+        ).fetchone() is not None
+        row = conn.execute(
+            "SELECT revoked_at FROM revoked_subjects WHERE sub = ? AND expires_at > ?", (sub, now)
+        ).fetchone()
+        return jti_revoked, row[0] if row else None
+
+
+shared_index = SharedIndex() if SHARED_INDEX else None